@@ -0,0 +1,181 @@
+"""
+Benchmark suite for the Python simulations
+Times the phases of the round schedule (fullTheta, fullrho, miniround) of every datapath in every simulation mode, the per bit, 64 bit and bit interleaved 32 bit reference implementations, populate and MemToState on messages drawn from a fixed seed
+Results are written as JSON with the median and percentiles of every measurement, and can be compared with an earlier result file to spot regressions
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+import numpy
+
+from sha3sim import (BACKENDS, NPHASES, SHA3, batchImplementation, interleavedImplementation, memPopulate, packedImplementation,
+                     referenceImplementation)
+from sha3sim.sha3 import PHASENAMES
+
+# Simulation modes as (blockwise, fastrho)
+MODES = { "slice" : (False, False),
+          "blockwise" : (True, False),
+          "fastrho" : (False, True),
+          "blockwise-fastrho" : (True, True) }
+
+PERCENTILES = [10, 25, 75, 90, 99]
+SCHEDULEPHASES = {"theta" : "fullTheta", "rho" : "fullrho", "miniround" : "miniround"}
+
+def messages(seed, count):
+    """
+    Single block messages of random length and content drawn from seed
+    """
+    rng = numpy.random.default_rng(seed)
+    return [rng.integers(0, 256, size=rng.integers(0, 136)).astype(numpy.uint8).tobytes() for i in range(count)]
+
+def stats(samples):
+    """
+    Summary of a list of timings in seconds
+    """
+    samples = numpy.array(samples)
+    result = { "samples" : int(samples.size),
+               "median" : float(numpy.median(samples)),
+               "mean" : float(samples.mean()),
+               "min" : float(samples.min()),
+               "max" : float(samples.max()) }
+    for p in PERCENTILES:
+        result["p%d" % p] = float(numpy.percentile(samples, p))
+    return result
+
+def timeit(function, *args):
+    """
+    Run function once and return the elapsed time in seconds
+    """
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+def benchSchedule(name, blockwise, fastrho, inputs, repeats):
+    """
+    Time every phase of the schedule and MemToState of a datapath, each phase call is one sample
+    """
+    sha = SHA3(name, blockwise, fastrho)
+    samples = {phase : [] for phase in SCHEDULEPHASES.values()}
+    samples["schedule"] = []
+    samples["MemToState"] = []
+    mark = [0.0]
+
+    def after(index, P, R, S, L):
+        now = time.perf_counter()
+        samples[SCHEDULEPHASES[PHASENAMES[(index-1)%3]]].append(now - mark[0])
+        mark[0] = time.perf_counter()
+
+    for r in range(repeats):
+        for message in inputs:
+            P = memPopulate()
+            P.populate(message)
+            R, S, L = sha.units()
+            samples["MemToState"].append(timeit(R.MemToState, P.sram))
+            start = time.perf_counter()
+            mark[0] = start
+            sha.schedule(P, R, S, L, 0, NPHASES, after)
+            samples["schedule"].append(time.perf_counter() - start)
+    return {key : stats(value) for key, value in samples.items()}
+
+def benchReference(inputs, repeats):
+    """
+    Time populate and the per bit, 64 bit and bit interleaved 32 bit reference implementations
+    The batch samples time one permutation of all inputs at once, divided by the number of inputs
+    """
+    samples = {"populate" : [], "referenceImplementation.Keccak" : [], "packedImplementation.Keccak" : [], "interleavedImplementation.Keccak" : [],
+               "batchImplementation.Keccak" : [], "interleavedImplementation.Keccak batch" : []}
+    states = []
+    for message in inputs:
+        P = memPopulate()
+        P.populate(message)
+        states.append(P.A)
+    for r in range(repeats):
+        for message in inputs:
+            P = memPopulate()
+            samples["populate"].append(timeit(P.populate, message))
+            samples["referenceImplementation.Keccak"].append(timeit(referenceImplementation(P.A).Keccak))
+            samples["packedImplementation.Keccak"].append(timeit(packedImplementation(P.A).Keccak))
+            samples["interleavedImplementation.Keccak"].append(timeit(interleavedImplementation(P.A).Keccak))
+        samples["batchImplementation.Keccak"].append(timeit(batchImplementation(numpy.array(states)).Keccak)/len(states))
+        samples["interleavedImplementation.Keccak batch"].append(timeit(interleavedImplementation(numpy.array(states)).Keccak)/len(states))
+    return {key : stats(value) for key, value in samples.items()}
+
+def runBenchmarks(backends=None, modes=None, seed=0, count=8, repeats=3):
+    """
+    Run the whole suite and return the result as a dictionary ready for JSON
+    """
+    inputs = messages(seed, count)
+    results = { "seed" : seed,
+                "inputs" : count,
+                "repeats" : repeats,
+                "python" : platform.python_version(),
+                "numpy" : numpy.__version__,
+                "reference" : benchReference(inputs, repeats),
+                "backends" : {} }
+    for name in (backends or sorted(BACKENDS)):
+        results["backends"][name] = {}
+        for mode in (modes or MODES):
+            blockwise, fastrho = MODES[mode]
+            results["backends"][name][mode] = benchSchedule(name, blockwise, fastrho, inputs, repeats)
+    return results
+
+def medians(results):
+    """
+    Flatten a result to {"backend/mode/phase" : median}
+    """
+    flat = {"reference/" + key : value["median"] for key, value in results["reference"].items()}
+    for name, modes in results["backends"].items():
+        for mode, phases in modes.items():
+            for phase, value in phases.items():
+                flat["%s/%s/%s" % (name, mode, phase)] = value["median"]
+    return flat
+
+def compare(results, baseline, threshold):
+    """
+    Print the ratio of every median to the baseline, returns the measurements slower than threshold times the baseline
+    """
+    old = medians(baseline)
+    regressions = []
+    for key, value in medians(results).items():
+        if key not in old:
+            continue
+        ratio = value/old[key]
+        flag = ""
+        if ratio > threshold:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        print("%-48s %12.6f %12.6f %8.2fx%s" % (key, old[key], value, ratio, flag))
+    return regressions
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Time the phases of the V1, V2 and V3 simulations")
+    parser.add_argument("-o", "--output", default="benchmark.json", help="JSON file for the results (default: benchmark.json)")
+    parser.add_argument("-b", "--backend", action="append", choices=sorted(BACKENDS), help="Datapath to time, may be repeated (default: all)")
+    parser.add_argument("-m", "--mode", action="append", choices=list(MODES), help="Simulation mode to time, may be repeated (default: all)")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="Seed of the input messages (default: 0)")
+    parser.add_argument("-n", "--inputs", type=int, default=8, help="Number of input messages (default: 8)")
+    parser.add_argument("-r", "--repeats", type=int, default=3, help="Runs over the inputs (default: 3)")
+    parser.add_argument("--baseline", help="Earlier result file to compare the medians with")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown against the baseline reported as a regression (default: 1.25)")
+    args = parser.parse_args()
+
+    results = runBenchmarks(args.backend, args.mode, args.seed, args.inputs, args.repeats)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+    else:
+        for key, value in medians(results).items():
+            print("%-48s %12.6f" % (key, value))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""
+Mode matrix check for the Python simulations
+Runs SHA3(name, blockwise, fastrho, fused, paritycache).verify and differential for every combination of the simulation modes on every datapath
+A combination passes when the final state matches the reference and no phase of the schedule differs from the reference in lockstep
+Also checks the sponge of every parameter set against a lane level sponge on packedImplementation, checkpoint resume from several phases,
+and interleavedImplementation against packedImplementation on single states and batches
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import tempfile
+
+import numpy
+
+from sha3sim import (BACKENDS, MODES, NPHASES, SHA3, batchImplementation, hashMessage, interleavedImplementation, memPopulate,
+                     packedImplementation, resume, saveCheckpoint)
+
+FLAGS = ["blockwise", "fastrho", "fused", "paritycache"]
+MESSAGES = ["", "abc", "x"*135]         # Empty, short and longest single block message
+CHUNKS = [1, 7, 0, 61, 200]             # Chunk sizes the sponge messages are split into, repeated
+SQUEEZEBLOCKS = 3                       # Output blocks squeezed in the extendable output modes
+RESUMEPHASES = [0, 1, 2, 3, 37, NPHASES-1, NPHASES]
+RESUMEMODES = [(False, False, False, False), (True, True, False, False), (True, True, True, True)]
+
+def checkMode(name, modes, message):
+    """
+    Verify and run differential on one message for a datapath and a (blockwise, fastrho, fused, paritycache) combination
+    Returns None if both match the reference, otherwise a description of the failure
+    """
+    sha = SHA3(name, *modes)
+    matched, sram = sha.verify(message)
+    if not matched:
+        return "final state differs from the reference"
+    P = memPopulate()
+    P.populate(message)
+    diff = sha.differential(P)
+    if diff is not None:
+        return "round %d %s differs in lanes %s" % (diff["round"], diff["step"], diff["lanes"])
+    return None
+
+def chunked(data):
+    """
+    Split data into chunks of the sizes in CHUNKS, so blocks are completed across chunk boundaries
+    """
+    chunks = []
+    start = 0
+    for size in itertools.cycle(CHUNKS):
+        if start >= len(data):
+            return chunks
+        chunks.append(data[start:start+size])
+        start += size
+
+def referenceSponge(data, rate, suffix, nbytes):
+    """
+    Lane level sponge on packedImplementation, message bytes are XORed into the lanes in FIPS 202 order (lane x+5*y)
+    """
+    blockbytes = int(rate/8)
+    padded = bytearray(data) + bytearray(blockbytes - len(data)%blockbytes)
+    padded[len(data)] ^= suffix
+    padded[-1] ^= 0x80
+    I = packedImplementation(numpy.zeros(shape=(5,5,64), dtype=int))
+    for start in range(0, len(padded), blockbytes):
+        block = bytes(padded[start:start+blockbytes]) + bytes(200-blockbytes)
+        I.lanes ^= numpy.frombuffer(block, dtype='<u8').reshape(5,5).T.reshape(25)     # Lane x+5*y of the block is lane 5*x+y
+        I.Keccak()
+    out = b""
+    while True:
+        out += I.lanes.reshape(5,5).T.reshape(25).astype('<u8').tobytes()[0:blockbytes]
+        if len(out) >= nbytes:
+            return out[0:nbytes]
+        I.Keccak()
+
+def checkSponge(name, mode):
+    """
+    Hash a message of several blocks, absorbed in uneven chunks, with one of the MODES on a datapath and compare it with referenceSponge
+    Extendable output modes squeeze SQUEEZEBLOCKS blocks and a few more bytes
+    """
+    rate, suffix, length = MODES[mode]
+    data = bytes(bytearray(i%251 for i in range(2*int(rate/8)+17)))
+    nbytes = length if length is not None else SQUEEZEBLOCKS*int(rate/8)+5
+    if hashMessage(mode, chunked(data), name, nbytes if length is None else None) != referenceSponge(data, rate, suffix, nbytes):
+        return "digest differs from the lane level sponge"
+    return None
+
+def checkResume(name, modes, phase, message, directory):
+    """
+    Run the schedule up to phase, write a checkpoint, resume it and compare the final SRAM with an uninterrupted run
+    """
+    sha = SHA3(name, *modes)
+    Q = memPopulate()
+    Q.populate(message)
+    expected = sha.run(Q)
+    P = memPopulate()
+    P.populate(message)
+    R, S, L = sha.units()
+    sha.schedule(P, R, S, L, 0, phase)
+    path = os.path.join(directory, "%s-%d.ckpt" % (name, phase))
+    saveCheckpoint(path, sha, P, R, S, phase)
+    sha, P, R, S, L = resume(path)
+    if (P.sram != expected).any():
+        return "final SRAM differs from an uninterrupted run"
+    return None
+
+def checkInterleaved(messages):
+    """
+    Compare interleavedImplementation with packedImplementation on the state of every message and on all of them as one batch
+    Returns a list of failure descriptions
+    """
+    errors = []
+    states = []
+    for message in messages:
+        P = memPopulate()
+        P.populate(message)
+        states.append(P.A)
+        I = interleavedImplementation(P.A)
+        I.Keccak()
+        J = packedImplementation(P.A)
+        J.Keccak()
+        if (I.A != J.A).any():
+            errors.append("%r : interleaved state differs from packedImplementation" % message)
+    I = interleavedImplementation(numpy.array(states))
+    I.Keccak()
+    lanes, expected = batchImplementation(numpy.array(states)).Keccak()
+    if (I.StateToMem() != expected).any():
+        errors.append("batch : interleaved SRAM images differ from batchImplementation")
+    return errors
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Check every simulation mode combination of the V1, V2 and V3 datapaths against the reference")
+    parser.add_argument("-b", "--backend", action="append", choices=sorted(BACKENDS), help="Datapath to check, may be repeated (default: all)")
+    parser.add_argument("-m", "--message", action="append", help="Message to hash, may be repeated (default: empty, \"abc\" and a full block)")
+    args = parser.parse_args()
+
+    backends = args.backend or sorted(BACKENDS)
+    messages = args.message or MESSAGES
+    failed = 0
+    total = 0
+    def check(label, error):
+        nonlocal failed, total
+        total += 1
+        if error is not None:
+            failed += 1
+            print("%s : %s" % (label, error))
+
+    for name in backends:
+        for modes in itertools.product([False, True], repeat=len(FLAGS)):
+            label = "+".join(flag for flag, on in zip(FLAGS, modes) if on) or "slice"
+            for message in messages:
+                check("%s %s %r" % (name, label, message), checkMode(name, modes, message))
+
+    for name in backends:
+        for mode in MODES:
+            check("%s sponge %s" % (name, mode), checkSponge(name, mode))
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name in backends:
+            for modes in RESUMEMODES:
+                label = "+".join(flag for flag, on in zip(FLAGS, modes) if on) or "slice"
+                for phase in RESUMEPHASES:
+                    check("%s %s resume from phase %d" % (name, label, phase), checkResume(name, modes, phase, messages[-1], directory))
+
+    errors = checkInterleaved(messages)
+    total += len(messages) + 1
+    failed += len(errors)
+    for error in errors:
+        print("interleaved %s" % error)
+
+    print("%d checks, %d passed, %d failed" % (total, total-failed, failed))
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
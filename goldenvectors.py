@@ -0,0 +1,69 @@
+"""
+Golden vector generator for the VHDL testbench
+Pads every message of a corpus (one per line) into its initial SRAM image and runs the reference permutation on all of them at once
+Writes the initial images to one multi-image input file and the final images to a matching expected-output file, both in the externalram.txt format, image i of both files belonging to message i
+"""
+
+import argparse
+import sys
+
+import numpy
+
+from sha3sim import batchImplementation, externalRam, readCorpus
+
+def padMessages(messages, rate=1088, suffix=0x06):
+    """
+    Pad single block messages (bytes) with the suffix and pad10*1 up to the rate
+    Returns an (N,200) array of state bytes, the capacity stays zero
+    """
+    blockbytes = int(rate/8)
+    lengths = numpy.array([len(m) for m in messages], dtype=int)
+    if (lengths >= blockbytes).any():
+        raise Exception("Messages %s too long for a single block" % list(numpy.flatnonzero(lengths >= blockbytes)))
+    blocks = numpy.zeros((len(messages), 200), dtype=numpy.uint8)
+    data = numpy.frombuffer(b"".join(messages), dtype=numpy.uint8)
+    rows = numpy.repeat(numpy.arange(len(messages)), lengths)
+    columns = numpy.arange(data.size) - numpy.repeat(numpy.cumsum(lengths) - lengths, lengths)
+    blocks[rows, columns] = data
+    blocks[numpy.arange(len(messages)), lengths] ^= suffix
+    blocks[:, blockbytes-1] ^= 0x80
+    return blocks
+
+def blocksToLanes(blocks):
+    """
+    Convert (N,200) state bytes in FIPS 202 order (lane x+5*y) to (N,25) uint64 lanes in the simulator order (lane 5*x+y)
+    """
+    lanes = numpy.ascontiguousarray(blocks).view('<u8').reshape(-1,5,5)
+    return lanes.transpose(0,2,1).reshape(-1,25).astype(numpy.uint64)
+
+def goldenVectors(messages, rate=1088, suffix=0x06):
+    """
+    Initial and expected final (N,200,8) SRAM images for a list of messages (bytes)
+    """
+    lanes = blocksToLanes(padMessages(messages, rate, suffix))
+    initial = batchImplementation(lanes).StateToMem()
+    final, expected = batchImplementation(lanes).Keccak()
+    return initial, expected
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Write multi-image input and expected-output files for the VHDL testbench from a corpus of messages")
+    parser.add_argument("corpus", help="File with one message per line")
+    parser.add_argument("-i", "--input", default="externalram.txt", help="Input image file (default: externalram.txt)")
+    parser.add_argument("-e", "--expected", default="expectedram.txt", help="Expected output image file (default: expectedram.txt)")
+    args = parser.parse_args()
+
+    messages = [line.encode() for line in readCorpus(args.corpus)]
+    blockbytes = int(1088/8)
+    skipped = [i for i, m in enumerate(messages) if len(m) >= blockbytes]
+    if skipped:
+        print("Skipping %d messages longer than one block: %s" % (len(skipped), skipped), file=sys.stderr)
+    messages = [m for m in messages if len(m) < blockbytes]
+
+    initial, expected = goldenVectors(messages)
+    externalRam(args.input).writeImages(initial)
+    externalRam(args.expected).writeImages(expected)
+    print("%d vectors written to %s and %s" % (len(messages), args.input, args.expected))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Regression runner for the Python simulations
+Reads a corpus of messages (one per line), runs the Version 1, 2 and 3 datapaths on every message and compares each result with a single reference result per message
+The corpus is sharded over a pool of worker processes, a failing message is recorded instead of stopping the run
+"""
+
+import argparse
+import functools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from sha3sim import BACKENDS, readCorpus, sweep
+
+def runShard(shard, backends):
+    """
+    Run the given datapaths on a shard of (index, message) pairs, the reference is computed once per message
+    Returns (index, {version : status}) for every message, where status is "PASS", "FAIL" or "ERROR: " followed by the error message
+    """
+    results = []
+    for index, message in shard:
+        try:
+            status = {name : "PASS" if matched else "FAIL" for name, (matched, sram) in sweep(message, backends).items()}
+        except Exception as e:              # Unsupported input such as a message longer than one block, or a failure of one of the simulations
+            status = dict.fromkeys(backends, "ERROR: %s" % e)
+        results.append((index, status))
+    return results
+
+def runCorpus(messages, backends=None, workers=None, shardsize=None):
+    """
+    Shard the messages over a process pool and collect the status of every message ordered by index
+    """
+    backends = backends or sorted(BACKENDS)
+    workers = workers or os.cpu_count() or 1
+    if shardsize is None:
+        shardsize = max(1, len(messages)//(4*workers))
+    indexed = list(enumerate(messages))
+    shards = [indexed[i:i+shardsize] for i in range(0, len(indexed), shardsize)]
+    results = [None]*len(messages)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for shard in pool.map(functools.partial(runShard, backends=backends), shards):
+            for index, status in shard:
+                results[index] = status
+    return results
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Run the V1, V2 and V3 simulations on a corpus of messages")
+    parser.add_argument("corpus", help="File with one message per line")
+    parser.add_argument("-b", "--backend", action="append", choices=sorted(BACKENDS), help="Datapath to run, may be repeated (default: all)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Number of worker processes (default: all cores)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only print failing messages and the summary")
+    args = parser.parse_args()
+
+    messages = readCorpus(args.corpus)
+    results = runCorpus(messages, args.backend, args.workers)
+
+    failed = 0
+    for index, status in enumerate(results):
+        passed = all(s == "PASS" for s in status.values())
+        if not passed:
+            failed += 1
+        if not passed or not args.quiet:
+            print("%d : %s : %r" % (index, " ".join("%s %s" % (v, s) for v, s in status.items()), messages[index]))
+
+    print("%d messages, %d passed, %d failed" % (len(messages), len(messages)-failed, failed))
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
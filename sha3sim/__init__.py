@@ -0,0 +1,16 @@
+"""
+Python simulation of the SHA-3 datapaths for RFID
+The core (padding, reference implementations, SRAM layout) is shared, the datapath of each version is a registered backend:
+    V1 - two 64 bit registers
+    V2 - one 64 bit register
+    V3 - same datapath as V2
+"""
+
+from .backends import BACKENDS, Datapath, getBackend, register
+from .core import (ROTATIONOFFSETS, ROUNDCONSTANTBITS, ROUNDCONSTANTS, ROUNDCONSTANTWORDS, batchImplementation,
+                   externalRam, interleavedImplementation, memPopulate, packedImplementation, readCorpus, referenceImplementation)
+from .sha3 import NPHASES, SHA3, Instrumentation, ParityCache, fusion, parityCacheSavings, sweep
+from .fsm import cycleModel
+from .checkpoint import checkpointer, loadCheckpoint, resume, saveCheckpoint
+from .sponge import MODES, Sponge, digest, hashMessage, throughput
+from . import v1, v2
@@ -0,0 +1,43 @@
+"""
+Registry of datapath backends
+A backend bundles the Register, SliceProcessor and LaneProcessor of one version together with the sizes the schedule needs
+"""
+
+BACKENDS = {}           # Name -> Datapath
+
+class Datapath:
+    """
+    Register, SliceProcessor and LaneProcessor classes of one datapath
+    slicesperblock is the number of slices loaded by Register.loadSliceBlock, lanesperload the number of lanes loaded by Register.loadLanes
+    """
+    def __init__(self, Register, SliceProcessor, LaneProcessor, slicesperblock, lanesperload):
+        self.Register = Register
+        self.SliceProcessor = SliceProcessor
+        self.LaneProcessor = LaneProcessor
+        self.slicesperblock = slicesperblock
+        self.lanesperload = lanesperload
+        self.nblocks = int(64/slicesperblock)           # Slice blocks per state
+        self.nloads = int(24/lanesperload)              # Lane loads per Rho stage, Lane(0,0) is not rotated
+        self.name = None                                # Set when registered
+
+    def units(self):
+        """
+        Create a fresh register file, slice processor and lane processor
+        """
+        return self.Register(), self.SliceProcessor(), self.LaneProcessor()
+
+def register(name, datapath):
+    """
+    Register a datapath backend under a name
+    """
+    datapath.name = name
+    BACKENDS[name] = datapath
+    return datapath
+
+def getBackend(name):
+    """
+    Look up a registered datapath backend
+    """
+    if name not in BACKENDS:
+        raise Exception("Unknown datapath %s, registered datapaths are %s" % (name, ", ".join(sorted(BACKENDS))))
+    return BACKENDS[name]
@@ -0,0 +1,107 @@
+"""
+Checkpoints of a simulation at phase boundaries of the round schedule
+A checkpoint holds the SRAM, the datapath registers, the parity registers and current slice of the slice processor and the index of the next phase, packed to bits in a small binary file
+Checkpoints written on every boundary let a long run be resumed or bisected without replaying it from the start
+"""
+
+import numpy
+import struct
+
+from .core import memPopulate
+from .sha3 import NPHASES, PHASENAMES, SHA3
+
+MAGIC = b"SHA3CKPT"
+VERSION = 1
+# Magic, format version, next phase, mode flags (1 blockwise, 2 fastrho, 4 fused, 8 parity cache), current slice, ParityReg, tempParityReg, register bits, backend name length
+HEADER = struct.Struct("<8sBBBbBBHB")
+
+def packBits(bits):
+    """
+    Pack a 0/1 array to bytes, first bit in the least significant bit
+    """
+    return numpy.packbits(numpy.asarray(bits, dtype=numpy.uint8).reshape(-1), bitorder='little').tobytes()
+
+def unpackBits(data, count):
+    """
+    Inverse of packBits, returns count bits as an int array
+    """
+    return numpy.unpackbits(numpy.frombuffer(data, dtype=numpy.uint8), count=count, bitorder='little').astype(int)
+
+def saveCheckpoint(path, sha, P, R, S, phase):
+    """
+    Write the state of a simulation about to run the given phase to path
+    See checkpointer for writing one at every phase boundary
+    """
+    if sha.backend is None:
+        raise Exception("Checkpoints need a registered backend")
+    name = sha.backend.encode()
+    register = packBits(R.R)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, phase, int(sha.blockwise) | 2*int(sha.fastrho) | 4*int(sha.fused) | 8*int(sha.paritycache), S.curslice,
+                            int(packBits(S.ParityReg)[0]), int(packBits(S.tempParityReg)[0]), R.R.size, len(name)))
+        f.write(name)
+        f.write(packBits(P.bits))
+        f.write(register)
+
+def loadCheckpoint(path):
+    """
+    Read a checkpoint and rebuild the simulation
+    Returns (sha, P, R, S, L, phase) where phase is the index of the next phase to run
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise Exception("Checkpoint %s is truncated" % path)
+    magic, version, phase, flags, curslice, parity, tempparity, nregister, namelength = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise Exception("%s is not a version %d checkpoint" % (path, VERSION))
+    offset = HEADER.size
+    name = data[offset:offset+namelength].decode()
+    offset += namelength
+    sramlength = int(1600/8)
+    registerlength = int((nregister+7)/8)
+    if len(data) != offset + sramlength + registerlength:
+        raise Exception("Checkpoint %s is truncated" % path)
+    if phase > NPHASES:
+        raise Exception("Phase %d out of range in %s" % (phase, path))
+
+    sha = SHA3(name, bool(flags & 1), bool(flags & 2), bool(flags & 4), bool(flags & 8))
+    P = memPopulate()
+    R, S, L = sha.units()
+    if R.R.size != nregister:
+        raise Exception("Register size of %s does not match backend %s" % (path, name))
+    P.bits[:] = unpackBits(data[offset:offset+sramlength], 1600)
+    offset += sramlength
+    R.R[:] = unpackBits(data[offset:offset+registerlength], nregister).reshape(R.R.shape)
+    S.ParityReg[:] = unpackBits(bytes([parity]), 5)
+    S.tempParityReg[:] = unpackBits(bytes([tempparity]), 5)
+    S.curslice = curslice
+    if curslice >= 0:
+        S.extractslice(curslice)
+    return sha, P, R, S, L, phase
+
+def checkpointer(pattern, sha):
+    """
+    Callback for SHA3.schedule writing a checkpoint at every phase boundary
+    pattern is formatted with the index of the next phase, e.g. "run-%02d.ckpt"
+    """
+    def after(phase, P, R, S, L):
+        saveCheckpoint(pattern % phase, sha, P, R, S, phase)
+    return after
+
+def resume(path, stop=NPHASES, after=None):
+    """
+    Load a checkpoint and run the schedule from its phase up to stop
+    Returns (sha, P, R, S, L) in the state reached
+    """
+    sha, P, R, S, L, phase = loadCheckpoint(path)
+    sha.schedule(P, R, S, L, phase, stop, after)
+    return sha, P, R, S, L
+
+def phaseName(phase):
+    """
+    Name of a phase index, e.g. "round 3 rho"
+    """
+    if phase == NPHASES:
+        return "done"
+    return "round %d %s" % (int(phase/3), PHASENAMES[phase%3])
@@ -0,0 +1,628 @@
+"""
+Shared core of the SHA-3 simulations
+Contains the round constants, padding and SRAM layout (memPopulate), the slice wise operations (SliceProcessor), the Barrel Shifter primitives (LaneProcessor), the reference implementations, the externalram.txt reader/writer and the corpus reader
+None of these depend on the datapath, so every version uses them, the datapaths only add the positions of slices and lanes in their registers
+"""
+
+import numpy
+
+#Round constants for Iota stage, bit z of round i is ROUNDCONSTANTS[i][64-z-1]
+ROUNDCONSTANTS = [ "0000000000000000000000000000000000000000000000000000000000000001",
+                   "0000000000000000000000000000000000000000000000001000000010000010",
+                   "1000000000000000000000000000000000000000000000001000000010001010",
+                   "1000000000000000000000000000000010000000000000001000000000000000",
+                   "0000000000000000000000000000000000000000000000001000000010001011",
+                   "0000000000000000000000000000000010000000000000000000000000000001",
+                   "1000000000000000000000000000000010000000000000001000000010000001",
+                   "1000000000000000000000000000000000000000000000001000000000001001",
+                   "0000000000000000000000000000000000000000000000000000000010001010",
+                   "0000000000000000000000000000000000000000000000000000000010001000",
+                   "0000000000000000000000000000000010000000000000001000000000001001",
+                   "0000000000000000000000000000000010000000000000000000000000001010",
+                   "0000000000000000000000000000000010000000000000001000000010001011",
+                   "1000000000000000000000000000000000000000000000000000000010001011",
+                   "1000000000000000000000000000000000000000000000001000000010001001",
+                   "1000000000000000000000000000000000000000000000001000000000000011",
+                   "1000000000000000000000000000000000000000000000001000000000000010",
+                   "1000000000000000000000000000000000000000000000000000000010000000",
+                   "0000000000000000000000000000000000000000000000001000000000001010",
+                   "1000000000000000000000000000000010000000000000000000000000001010",
+                   "1000000000000000000000000000000010000000000000001000000010000001",
+                   "1000000000000000000000000000000000000000000000001000000010000000",
+                   "0000000000000000000000000000000010000000000000000000000000000001",
+                   "1000000000000000000000000000000010000000000000001000000000001000" ]
+
+#Round constants as a 24*64 bit matrix (bit z of round i in column z) and as 64 bit words, shared by every processor
+ROUNDCONSTANTBITS = numpy.array([[int(rc[64-z-1]) for z in range(64)] for rc in ROUNDCONSTANTS], dtype=int)
+ROUNDCONSTANTBITS.flags.writeable = False
+ROUNDCONSTANTWORDS = numpy.array([int(rc, 2) for rc in ROUNDCONSTANTS], dtype=numpy.uint64)
+ROUNDCONSTANTWORDS.flags.writeable = False
+
+#Keccak rotation offsets of lane 5*x+y
+ROTATIONOFFSETS = [0, 1, 3,  6,  10, 15, 21, 28, 36, 45, 55, 2,  14,
+                   27, 41, 56, 8, 25, 43, 62, 18, 39, 61, 20, 44 ]
+
+class memPopulate:
+    """ 
+    Contains the SRAM and functions used to initialize the SRAM with a binary given state
+    populate function takes a 5*5*64 state as input and returns a 200*8 SRAM with lanes interleaved except Lane(0,0)
+    """
+
+    memindex = numpy.array(list(range(64)) + [64*(2*(i//128)+1+i%2)+(i%128)//2 for i in range(1536)])     # State bit 64*(5*x+y)+z stored at each SRAM bit, as in StateToMem
+    memindex.flags.writeable = False
+    sramindex = numpy.argsort(memindex)                                                                     # SRAM bit holding each state bit 64*(5*x+y)+z
+    sramindex.flags.writeable = False
+    # SRAM bit holding bit k of a message block in FIPS 202 order, i.e. bit k%64 of lane (x,y) with x+5*y = int(k/64)
+    messageindex = sramindex[numpy.array([64*(5*(int(k/64)%5)+int(k/320))+k%64 for k in range(1600)])]
+    messageindex.flags.writeable = False
+
+    def __init__(self):
+        self._bits = numpy.zeros(shape=(1600,), dtype=numpy.uint8)     #SRAM contents, one byte per bit
+        self._sram = self._bits.reshape(200,8)                          #SRAM as 200 words of 8 bits (view of the same buffer)
+        self.A = numpy.zeros(shape=(5,5,64), dtype=int)         #State
+
+    @property
+    def bits(self):
+        """
+        SRAM contents as 1600 bits, the same buffer as sram
+        The property cannot be assigned, write into the array instead (e.g. P.bits[:] = ...)
+        """
+        return self._bits
+
+    @property
+    def sram(self):
+        """
+        SRAM contents as 200 words of 8 bits, the same buffer as bits
+        The property cannot be assigned, write into the array instead (e.g. P.sram[:] = ...)
+        """
+        return self._sram
+
+    def BytesToState(self, data, rate=1088, suffix=0x06):
+        """
+        Pad a single block message given as bytes and convert it to a SHA-3 state
+        Uses FIPS 202 bit ordering: bit i of byte j is message bit 8*j+i, and message bit k is A[x][y][k%64] with x+5*y = int(k/64)
+        The message is padded with the suffix and pad10*1 up to the rate, the capacity stays zero
+        """
+        blockbytes = int(rate/8)
+        if len(data) >= blockbytes:
+            raise Exception("String too long for current version: %d bytes, a single block holds at most %d" % (len(data), blockbytes-1))
+        block = bytearray(200)
+        block[0:len(data)] = data
+        block[len(data)] ^= suffix          #Pad 0x06
+        block[blockbytes-1] ^= 0x80         #End padding with 0x80
+        bits = numpy.unpackbits(numpy.frombuffer(bytes(block), dtype=numpy.uint8), bitorder='little')
+        self.A = bits.reshape(5,5,64).transpose(1,0,2).astype(int)     #Lane x+5*y of the block is A[x][y]
+        return self.A
+
+    def StringToState(self, strinp):
+        """
+        Take a string (encoded as UTF-8) or bytes as input and convert it to a SHA-3 state
+        """
+        if isinstance(strinp, str):
+            strinp = strinp.encode()
+        return self.BytesToState(strinp)
+
+    def StateToMem(self, A):                
+        """
+        Store a state to SRAM using interleaved mode of storage
+        A single gather through memindex, which holds the state bit stored at every SRAM bit
+        """
+        self.bits[:] = numpy.asarray(A).reshape(1600)[self.memindex]
+        return self.sram
+
+    def packed(self):
+        """
+        Pack the SRAM into 200 bytes, bit j of word i is bit j of byte i
+        """
+        return numpy.packbits(self.sram, axis=1, bitorder='little').reshape(200)
+
+    def snapshot(self):
+        """
+        Copy of the SRAM contents (a single copy of the bit buffer)
+        """
+        return self.sram.copy()
+
+    def populate(self, A):                  
+        """
+        Handler function to populate SRAM
+        """
+        return self.StateToMem(self.StringToState(A))
+
+class SliceProcessor:
+
+    """
+    Slice wise operations shared by the datapaths
+    A datapath subclasses it and supplies the positions of a slice in its registers, one row per slice of a slice block:
+        slicex : indices of the (x,y) element of a slice in the registers, as computed by the original extractslice
+        sliceidx : the same indices into the flattened registers
+        pisrc : source of the (x,y) element for Pi
+    The number of slices per block is len(sliceidx)
+    """
+
+    colnext = numpy.array([1, 2, 3, 4, 0])          # Column x+1 for each x
+    colnext2 = numpy.array([2, 3, 4, 0, 1])         # Column x+2 for each x
+    colprev2 = numpy.array([3, 4, 0, 1, 2])         # Column x-2 for each x
+    RC = ROUNDCONSTANTBITS                          # Round constant bits for Iota stage, RC[rnd][z]
+
+    def __init__(self):
+        self.ParityReg = numpy.zeros(shape=(5,), dtype=int)     #Parity register used for Theta step
+        self.tempParityReg = numpy.zeros(shape=(5,), dtype=int)
+        self.x = numpy.zeros(shape=self.slicex.shape[1:], dtype=int)     #Contains indices of slices in the registers when a slice is loaded
+        self.curslice = -1                                      #Index of current slice block in registers
+
+    def extractslice(self, pos):
+        """
+        Function to select the indices of a given slice when loaded into the registers
+        The indices only depend on the position of the slice in its block and are looked up from the precomputed tables, since they are pre-determined in hardware as well
+        The indices of a given slice are stored in self.x
+        The (x,y) element of a slice can be accessed from the flattened registers as R.reshape(-1)[self.idx[x][y]]
+        """
+        n = len(self.sliceidx)                  # Slices per block
+        self.x = self.slicex[pos%n]
+        self.idx = self.sliceidx[pos%n]
+        self.pix = self.pisrc[pos%n]
+
+    def storeParity(self, R, nslice):
+        """
+        Calculates column parities of given slice and stores it in the parity register
+        """
+        if (self.curslice != nslice):
+            self.extractslice(nslice)
+            self.curslice = nslice
+        S = R.reshape(-1)[self.idx]
+        self.tempParityReg[:] = self.ParityReg
+        self.ParityReg[:] = S[:,0] ^ S[:,1] ^ S[:,2] ^ S[:,3] ^ S[:,4]
+
+    def theta(self, R, nslice):
+        """
+        Slice wise Theta stage implementation
+        """
+        if (self.curslice != nslice):
+            self.extractslice(nslice)
+            self.curslice = nslice
+        R = R.reshape(-1)
+        S = R[self.idx]
+        self.tempParityReg ^= (S[:,0] ^ S[:,1] ^ S[:,2] ^ S[:,3] ^ S[:,4])[self.colprev2]
+        R[self.idx] = S ^ self.tempParityReg[self.colnext].reshape(5,1)
+
+    def pi(self, R, nslice):
+        """
+        Slice wise Pi stage implementation
+        """
+        if (self.curslice != nslice):
+            self.extractslice(nslice)
+            self.curslice = nslice
+        R = R.reshape(-1)
+        R[self.idx] = R[self.pix]
+
+    def chi(self, R, nslice):
+        """
+        Slice wise Chi stage implementation
+        """
+        if (self.curslice != nslice):
+            self.extractslice(nslice)
+            self.curslice = nslice
+        R = R.reshape(-1)
+        S = R[self.idx]
+        R[self.idx] = S ^ ((S[self.colnext] ^ 1) & S[self.colnext2])
+
+    def iota(self, R, nslice, rnd):
+        """
+        Slice wise Iota stage implementation
+        """
+        if (self.curslice != nslice):
+            self.extractslice(nslice)
+            self.curslice = nslice
+        R.reshape(-1)[self.idx[0][0]] ^= self.RC[rnd][nslice]
+
+    def thetaBlock(self, R, nblock):
+        """
+        Theta stage applied to all slices of a slice block at once
+        Column parities are carried from slice to slice as storeParity and theta do, starting from the parity of the previous slice in ParityReg
+        """
+        n = len(self.sliceidx)                  # Slices per block
+        R = R.reshape(-1)
+        S = R[self.sliceidx]
+        P = S[:,:,0] ^ S[:,:,1] ^ S[:,:,2] ^ S[:,:,3] ^ S[:,:,4]
+        T = numpy.concatenate((self.ParityReg.reshape(1,5), P[:-1])) ^ P[:,self.colprev2]
+        R[self.sliceidx] = S ^ T[:,self.colnext].reshape(n,5,1)
+        self.tempParityReg[:] = T[-1]
+        self.ParityReg[:] = P[-1]
+        self.curslice = n*nblock+n-1
+        self.extractslice(self.curslice)
+
+    def thetaWrap(self, R):
+        """
+        Wrap-around fix-up of Theta on slice 0 when Theta runs in the same pass as the previous miniround
+        Slice 0 was processed before slice 63, so its Theta lacks the parity of slice 63, which is left in ParityReg at the end of the pass
+        The slice block holding slice 0 must be loaded in the registers
+        """
+        R.reshape(-1)[self.sliceidx[0]] ^= self.ParityReg[self.colnext].reshape(5,1)
+        self.curslice = 0
+        self.extractslice(self.curslice)
+
+    def piBlock(self, R, nblock):
+        """
+        Pi stage applied to all slices of a slice block at once
+        """
+        n = len(self.sliceidx)                  # Slices per block
+        R = R.reshape(-1)
+        R[self.sliceidx] = R[self.pisrc]
+        self.curslice = n*nblock+n-1
+        self.extractslice(self.curslice)
+
+    def chiBlock(self, R, nblock):
+        """
+        Chi stage applied to all slices of a slice block at once
+        """
+        n = len(self.sliceidx)                  # Slices per block
+        R = R.reshape(-1)
+        S = R[self.sliceidx]
+        R[self.sliceidx] = S ^ ((S[:,self.colnext] ^ 1) & S[:,self.colnext2])
+        self.curslice = n*nblock+n-1
+        self.extractslice(self.curslice)
+
+    def iotaBlock(self, R, nblock, rnd):
+        """
+        Iota stage applied to all slices of a slice block at once
+        """
+        n = len(self.sliceidx)                  # Slices per block
+        R.reshape(-1)[self.sliceidx[:,0,0]] ^= self.RC[rnd][n*nblock:n*nblock+n]
+        self.curslice = n*nblock+n-1
+        self.extractslice(self.curslice)
+
+class LaneProcessor:
+
+    """
+    Barrel Shifter primitives shared by the lane processors of the datapaths
+    A Barrel Shifter reads a 4 bit register section, the shifts work in place on scratch buffers so no arrays are allocated per section
+    """
+
+    # Barrel Shifter lookup tables, row s gives the section bit moved to each output bit by a shift of s, index 4 is the constant 0
+    shiftleft = numpy.array([[i+s if i+s < 4 else 4 for i in range(4)] for s in range(5)])
+    shiftleft.flags.writeable = False
+    shiftright = numpy.array([[i-s if i-s >= 0 else 4 for i in range(4)] for s in range(5)])
+    shiftright.flags.writeable = False
+
+    def shift_array_left_into(self, out, array, bits):
+        """
+        Barrel Shifter left shift written into out without allocating
+        array is a scratch section holding the 4 input bits followed by a constant 0
+        """
+        numpy.take(array, self.shiftleft[bits], out=out, mode='clip')
+
+    def shift_array_right_into(self, out, array, bits):
+        """
+        Barrel Shifter right shift written into out without allocating
+        array is a scratch section holding the 4 input bits followed by a constant 0
+        """
+        numpy.take(array, self.shiftright[bits], out=out, mode='clip')
+
+    def xor_arrays_into(self, out, array):
+        """
+        XOR array into out in place
+        """
+        numpy.bitwise_xor(out, array, out=out)
+
+class referenceImplementation:
+
+    """
+    Reference SHA-3 implementation to test output
+    """
+
+    rotc = ROTATIONOFFSETS
+    RC = ROUNDCONSTANTBITS
+
+    def __init__(self, state):
+        self.A = numpy.zeros(shape=(5,5,64), dtype=int)
+        self.B = numpy.zeros(shape=(5,5,64), dtype=int)
+        for i in range(5):
+            for j in range(5):
+                for k in range(64):
+                    self.A[i][j][k] = state[i][j][k]
+
+    def theta(self):
+        C = numpy.zeros(shape=(5, 64), dtype=int)
+        D = numpy.zeros(shape=(5, 64), dtype=int)
+        for z in range(64):
+            for x in range(5):
+                C[x][z] = self.A[x][0][z] ^ self.A[x][1][z] ^ self.A[x][2][z] ^ self.A[x][3][z] ^ self.A[x][4][z]
+        for z in range(64): 
+            for x in range(5):
+                D[x][z] = C[(x-1)%5][z] ^ C[(x+1)%5][(z-1)%64]
+        for z in range(64):
+            for x in range(5):
+                for y in range(5):
+                    self.A[x][y][z] = self.A[x][y][z] ^ D[x][z]
+    
+    def rhopi(self):
+        for x in range(5):
+            for y in range(5):
+                self.B[y][(2*x+3*y)%5] = numpy.roll(self.A[x][y], 64-self.rotc[5*x+y])
+
+    def chi(self, z):
+        for x in range(5):
+            for y in range(5):
+                    self.A[x][y][z] = self.B[x][y][z] ^ ((~self.B[(x+1)%5][y][z]) & self.B[(x+2)%5][y][z])
+
+    def iota(self, z, rnd):
+        self.A[0][0][z] = self.A[0][0][z] ^ self.RC[rnd][z]
+
+    def Keccak(self):
+
+        for i in range(24):
+            self.theta()
+            self.rhopi()
+            for z in range(64):
+                self.chi(z)
+            for z in range(64):
+                self.iota(z, i)
+
+
+class packedImplementation:
+
+    """
+    Reference SHA-3 implementation holding the state as 25 packed 64 bit lanes
+    Lane 5*x+y holds A[x][y][z] in bit z, so rotations are done with shifts instead of numpy.roll on bit arrays
+    The state is also available as the 5*5*64 bit array A, a read-only copy of the lanes: A must be assigned as a whole (I.A = state), per bit writes as on referenceImplementation are not possible
+    chi and iota work on whole lanes, so they take no slice index z (chi() and iota(rnd) instead of chi(z) and iota(z, rnd))
+    """
+
+    rotc = numpy.array(ROTATIONOFFSETS, dtype=numpy.uint64)
+    rotcleft = (numpy.uint64(64) - rotc) % numpy.uint64(64)                            # Complementary left shifts for the rotations
+    pidest = numpy.array([5*y+(2*x+3*y)%5 for x in range(5) for y in range(5)])     # Lane 5*x+y is moved to lane pidest[5*x+y] by Pi
+    xprev = numpy.array([4, 0, 1, 2, 3])                # Column x-1 for each x
+    xnext = numpy.array([1, 2, 3, 4, 0])                # Column x+1 for each x
+    chinext = (numpy.arange(25)+5)%25                   # Lane (x+1,y) for each lane (x,y)
+    chinext2 = (numpy.arange(25)+10)%25                 # Lane (x+2,y) for each lane (x,y)
+    one = numpy.uint64(1)
+    sixtythree = numpy.uint64(63)
+    RC = ROUNDCONSTANTWORDS
+
+    def __init__(self, state):
+        self.A = state
+
+    @property
+    def A(self):
+        """
+        5*5*64 bit array copy of the packed lanes, read-only since writes to it would not reach the lanes
+        """
+        bits = numpy.unpackbits(self.lanes.astype('<u8', order='C').view(numpy.uint8), axis=-1, bitorder='little')
+        A = bits.reshape(self.lanes.shape[:-1]+(5,5,64)).astype(int)
+        A.flags.writeable = False
+        return A
+
+    @A.setter
+    def A(self, state):
+        state = numpy.asarray(state, dtype=numpy.uint8)
+        packed = numpy.packbits(state.reshape(state.shape[:-3]+(25,64)), axis=-1, bitorder='little').view('<u8')
+        self.lanes = packed.reshape(state.shape[:-3]+(25,)).astype(numpy.uint64)
+
+    def theta(self):
+        A = self.lanes.reshape(self.lanes.shape[:-1]+(5,5))
+        C = A[...,0] ^ A[...,1] ^ A[...,2] ^ A[...,3] ^ A[...,4]
+        C1 = C[...,self.xnext]
+        D = C[...,self.xprev] ^ ((C1 << self.one) | (C1 >> self.sixtythree))
+        A ^= D[...,None]
+
+    def rhopi(self):
+        B = numpy.empty_like(self.lanes)
+        B[...,self.pidest] = (self.lanes >> self.rotc) | (self.lanes << self.rotcleft)
+        self.lanes = B
+
+    def rho(self):
+        """
+        Rho alone, every lane is rotated in place as the lane processor does
+        """
+        self.lanes = (self.lanes >> self.rotc) | (self.lanes << self.rotcleft)
+
+    def pi(self):
+        B = numpy.empty_like(self.lanes)
+        B[...,self.pidest] = self.lanes
+        self.lanes = B
+
+    def bits(self):
+        """
+        Flat state bits, bit 64*(5*x+y)+z is A[x][y][z]
+        """
+        return numpy.unpackbits(self.lanes.astype('<u8', order='C').view(numpy.uint8), axis=-1, bitorder='little')
+
+    def chi(self):
+        B = self.lanes
+        self.lanes = B ^ (~B[...,self.chinext] & B[...,self.chinext2])
+
+    def iota(self, rnd):
+        self.lanes[...,0] ^= self.RC[rnd]
+
+    def Keccak(self):
+
+        for i in range(24):
+            self.theta()
+            self.rhopi()
+            self.chi()
+            self.iota(i)
+
+class batchImplementation(packedImplementation):
+
+    """
+    Packed lane implementation applied to N states at once
+    Takes either an (N,25) array of uint64 lanes or an (N,5,5,64) bit array, every step is a whole array operation over the batch axis
+    """
+
+    def __init__(self, states):
+        states = numpy.asarray(states)
+        if states.ndim == 2:
+            if states.shape[1] != 25:
+                raise Exception("Incorrect dimensions of lane array")
+            self.lanes = states.astype(numpy.uint64)
+        elif states.ndim == 4:
+            self.A = states
+        else:
+            raise Exception("Incorrect dimensions of state array")
+
+    def StateToMem(self):
+        """
+        Store all N states to (N,200,8) SRAM images using the interleaved mode of storage
+        """
+        bits = numpy.unpackbits(self.lanes.astype('<u8', order='C').view(numpy.uint8), axis=-1, bitorder='little')
+        return bits[:,memPopulate.memindex].reshape(-1,200,8)
+
+    def Keccak(self):
+        """
+        Apply all 24 rounds to every state, returns the (N,25) output lanes and their (N,200,8) SRAM images
+        """
+        packedImplementation.Keccak(self)
+        return self.lanes, self.StateToMem()
+
+class interleavedImplementation:
+
+    """
+    Reference SHA-3 implementation in the bit interleaved representation, for 32 bit targets
+    Lane 5*x+y is held as two 32 bit words, word 0 holding the even bits (bit k is A[x][y][2k]) and word 1 the odd bits (bit k is A[x][y][2k+1])
+    A rotation of a 64 bit lane by r becomes two 32 bit rotations by about r/2, with the halves swapped when r is odd
+    Like packedImplementation the state is also available as the 5*5*64 bit array A, and any leading axes are treated as a batch
+    """
+
+    rotc = packedImplementation.rotc.astype(int)
+    # Rho, bit z of the rotated lane is bit z+r of the lane: the even half comes from half r%2 rotated by int(r/2), the odd half from the other half rotated by int((r+1)/2)
+    rhosrc = numpy.array([[r%2, 1-r%2] for r in rotc])
+    rhoshift = numpy.array([[int(r/2)%32, int((r+1)/2)%32] for r in rotc], dtype=numpy.uint32)
+    rhoshiftleft = (numpy.uint32(32) - rhoshift) % numpy.uint32(32)
+    lanes25 = numpy.arange(25).reshape(25,1)
+    pidest = packedImplementation.pidest
+    xprev = packedImplementation.xprev
+    xnext = packedImplementation.xnext
+    chinext = packedImplementation.chinext
+    chinext2 = packedImplementation.chinext2
+    one = numpy.uint32(1)
+    thirtyone = numpy.uint32(31)
+    RC = numpy.array([[sum(int(rc[64-(2*k+h)-1]) << k for k in range(32)) for h in range(2)] for rc in ROUNDCONSTANTS], dtype=numpy.uint32)   # Even and odd halves of the round constants
+    RC.flags.writeable = False
+
+    def __init__(self, state):
+        self.A = state
+
+    @property
+    def A(self):
+        """
+        5*5*64 bit array view of the interleaved lanes
+        """
+        bits = numpy.unpackbits(self.lanes.astype('<u4', order='C').view(numpy.uint8), axis=-1, bitorder='little')
+        bits = bits.reshape(self.lanes.shape[:-2]+(25,2,32))
+        state = numpy.empty(self.lanes.shape[:-2]+(25,64), dtype=int)
+        state[...,0::2] = bits[...,0,:]
+        state[...,1::2] = bits[...,1,:]
+        return state.reshape(self.lanes.shape[:-2]+(5,5,64))
+
+    @A.setter
+    def A(self, state):
+        state = numpy.asarray(state, dtype=numpy.uint8)
+        lanes = state.reshape(state.shape[:-3]+(25,64))
+        halves = numpy.stack((lanes[...,0::2], lanes[...,1::2]), axis=-2)
+        packed = numpy.packbits(numpy.ascontiguousarray(halves), axis=-1, bitorder='little').view('<u4')
+        self.lanes = packed.reshape(state.shape[:-3]+(25,2)).astype(numpy.uint32)
+
+    def MemToState(self, sram):
+        """
+        Load the state from one or several 200*8 SRAM images in the memPopulate layout
+        """
+        bits = numpy.asarray(sram).reshape(numpy.shape(sram)[:-2]+(1600,))
+        self.A = bits[...,memPopulate.sramindex].reshape(bits.shape[:-1]+(5,5,64))
+        return self.A
+
+    def StateToMem(self):
+        """
+        Store the state to 200*8 SRAM images in the memPopulate layout
+        """
+        bits = self.A.reshape(self.lanes.shape[:-2]+(1600,))
+        return bits[...,memPopulate.memindex].reshape(self.lanes.shape[:-2]+(200,8))
+
+    def theta(self):
+        A = self.lanes.reshape(self.lanes.shape[:-2]+(5,5,2))
+        C = A[...,0,:] ^ A[...,1,:] ^ A[...,2,:] ^ A[...,3,:] ^ A[...,4,:]
+        C1 = C[...,self.xnext,:]
+        D = numpy.empty_like(C)
+        D[...,0] = (C1[...,1] << self.one) | (C1[...,1] >> self.thirtyone)     # Rotating by 1 moves the odd half to the even half rotated by 1
+        D[...,1] = C1[...,0]
+        D ^= C[...,self.xprev,:]
+        A ^= D[...,None,:]
+
+    def rhopi(self):
+        B = numpy.empty_like(self.lanes)
+        S = self.lanes[...,self.lanes25,self.rhosrc]
+        B[...,self.pidest,:] = (S >> self.rhoshift) | (S << self.rhoshiftleft)
+        self.lanes = B
+
+    def chi(self):
+        B = self.lanes
+        self.lanes = B ^ (~B[...,self.chinext,:] & B[...,self.chinext2,:])
+
+    def iota(self, rnd):
+        self.lanes[...,0,:] ^= self.RC[rnd]
+
+    def Keccak(self):
+
+        for i in range(24):
+            self.theta()
+            self.rhopi()
+            self.chi()
+            self.iota(i)
+
+class externalRam:
+
+    """
+    Streaming reader and writer for SRAM images in the externalram.txt format
+    An image is 200 lines holding one 8 bit word each (bit 7 first), a file may hold any number of concatenated images
+    Images are parsed one at a time, so traces of every intermediate state can be processed in constant memory
+    """
+
+    def __init__(self, path="externalram.txt"):
+        self.path = path
+
+    def packedImages(self):
+        """
+        Lazily yield every image in the file as 200 packed bytes, bit j of word i is bit j of byte i
+        Blank lines are ignored, any other line must be exactly 8 binary digits
+        """
+        with open(self.path, "r") as rampt:
+            image = bytearray()
+            for number, line in enumerate(rampt, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                if len(line) != 8 or line.strip("01"):
+                    raise Exception("Line %d of %s is not an 8 bit binary word: %r" % (number, self.path, line))
+                image.append(int(line, 2))
+                if len(image) == 200:
+                    yield bytes(image)
+                    image = bytearray()
+            if image:
+                raise Exception("Incorrect dimensions of filedata")
+
+    def images(self):
+        """
+        Lazily yield every image in the file as a 200*8 SRAM in the memPopulate.sram layout
+        """
+        for image in self.packedImages():
+            yield numpy.unpackbits(numpy.frombuffer(image, dtype=numpy.uint8), bitorder='little').reshape(200,8)
+
+    def writeImages(self, images, mode="w"):
+        """
+        Write 200*8 SRAM images from any iterable to the file, one at a time
+        Use mode "a" to append to an existing trace
+        Returns the number of images written
+        """
+        count = 0
+        with open(self.path, mode) as rampt:
+            for sram in images:
+                packed = numpy.packbits(numpy.asarray(sram, dtype=numpy.uint8).reshape(200,8), axis=1, bitorder='little').reshape(200)
+                rampt.write("".join("{:08b}\n".format(word) for word in packed))
+                count += 1
+        return count
+
+def readCorpus(path):
+    """
+    Read messages from a corpus file, one message per line
+    """
+    with open(path, "r") as corpus:
+        return [line.rstrip("\n") for line in corpus]
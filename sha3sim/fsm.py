@@ -0,0 +1,88 @@
+"""
+Cycle level model of the counter driven FSM of Version_3/TestBench/sha3.vhd
+Every control signal of sha3.vhd is a function of the global counter ci, so the model computes the signals for all counter values at once and many SRAM images in one call
+The FSM as written only sequences the SRAM load: for ci = 0 to 199 the word on sha3_datain is latched into SRAM word ci, register64 is held in reset, the slice and lane processors are bypassed, and EOC rises once ci reaches 201
+"""
+
+import numpy
+
+from .core import externalRam
+
+class cycleModel:
+
+    """
+    Per cycle signals of sha3.vhd driven by sha3_tb.vhd, indexed by the counter value ci
+    The testbench increments the counter on every rising clock edge until EOC, so ci is also the cycle count
+    """
+
+    WORDS = 200             # SRAM words, loaded at ci = 0 to 199 (SRAMcontrol)
+    EOCCOUNT = 201          # EOCcontrol raises EOC for ci >= 201, the testbench counter stops there
+    CONTROLS = ["ci", "addr", "we", "regreset", "byp_theta", "byp_ixp", "byp_lane", "eoc"]
+
+    def __init__(self):
+        ci = numpy.arange(self.EOCCOUNT+1)
+        self.ci = ci
+        self.addr = numpy.minimum(ci, self.WORDS-1)        # addr starts at 0 and is incremented on the falling edge while 0 < ci < 200
+        self.we = (ci < self.WORDS).astype(numpy.uint8)     # we and the RAM clock are enabled for ci < 200
+        self.eoc = (ci >= self.EOCCOUNT).astype(numpy.uint8)
+        self.regreset = numpy.ones(ci.size, dtype=numpy.uint8)     # REGcontrol holds register64 in reset, so q stays 0
+        self.byp_theta = numpy.ones(ci.size, dtype=numpy.uint8)    # SLICEcontrol bypasses Theta and Pi, Chi, Iota
+        self.byp_ixp = numpy.ones(ci.size, dtype=numpy.uint8)
+        self.byp_lane = numpy.ones(ci.size, dtype=numpy.uint8)     # LANEcontrol bypasses Rho and never clocks the rho registers
+
+    def cycles(self):
+        """
+        Counter value (clock cycles) at which EOC is raised
+        """
+        return int(numpy.argmax(self.eoc))
+
+    def trace(self, images):
+        """
+        Per cycle signals for one (200*8) or several (N*200*8) SRAM images supplied on sha3_datain, word i being content(i) of the testbench
+        Returns a dict of arrays with a leading image axis (when several images are given) and, except sram, a cycle axis of length EOCCOUNT+1:
+            ci, addr, we, regreset, byp_theta, byp_ixp, byp_lane, eoc : control signals
+            datain : word on the SRAM input port (0 once ci >= 200)
+            q : 64 bit register contents
+            sram : SRAM contents at EOC, word i is latched at the end of cycle i
+        """
+        images = numpy.asarray(images, dtype=numpy.uint8)
+        single = images.ndim == 2
+        images = images.reshape((-1, self.WORDS, 8))
+        n = images.shape[0]
+        steps = self.ci.size
+
+        datain = numpy.zeros((n, steps, 8), dtype=numpy.uint8)
+        datain[:,0:self.WORDS] = images
+        result = {"datain" : datain,
+                  "q" : numpy.zeros((n, steps, 64), dtype=numpy.uint8),
+                  "sram" : self.run(images)}
+        for name in self.CONTROLS:
+            result[name] = numpy.broadcast_to(getattr(self, name), (n, steps))
+        if single:
+            result = {name : value[0] for name, value in result.items()}
+        return result
+
+    def run(self, images):
+        """
+        Final SRAM contents at EOC for one or several SRAM images
+        """
+        images = numpy.asarray(images, dtype=numpy.uint8)
+        return images.copy()            # Every word is written once and the datapath never modifies the SRAM
+
+    def writeTrace(self, path, image):
+        """
+        Write the per cycle signals of one SRAM image as text, one line per counter value
+        ci addr we datain(binary, bit 7 first) q(hex) eoc
+        """
+        trace = self.trace(image)
+        with open(path, "w") as f:
+            for i in range(self.ci.size):
+                word = "".join(str(int(b)) for b in trace["datain"][i][::-1])
+                q = "%016X" % int("".join(str(int(b)) for b in trace["q"][i][::-1]), 2)
+                f.write("%d %d %d %s %s %d\n" % (trace["ci"][i], trace["addr"][i], trace["we"][i], word, q, trace["eoc"][i]))
+
+    def traceFile(self, path="externalram.txt"):
+        """
+        Per cycle signals for every image of an externalram.txt file
+        """
+        return self.trace(numpy.array(list(externalRam(path).images())))
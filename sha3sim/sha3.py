@@ -0,0 +1,555 @@
+"""
+Round schedule of the simulations, shared by every datapath backend
+"""
+
+import numpy
+import sys
+
+from .backends import BACKENDS, getBackend
+from .core import externalRam, memPopulate, packedImplementation
+
+NPHASES = 72            # Theta, Rho and miniround of each of the 24 rounds
+PHASENAMES = ["theta", "rho", "miniround"]
+
+class SHA3:
+    """
+    Class for calling lanewise and slicewise operations and implement overall algorithm
+    backend is the name of a registered datapath (V1, V2, V3) or a Datapath
+    """
+    def __init__(self, backend="V1", blockwise=False, fastrho=False, fused=False, paritycache=False):
+        self.datapath = getBackend(backend) if isinstance(backend, str) else backend
+        self.backend = self.datapath.name
+        self.blockwise = blockwise      # Apply slice wise stages to whole slice blocks at once instead of slice by slice
+        self.fastrho = fastrho          # Rotate whole lanes in Rho instead of simulating the Barrel Shifter section by section
+        self.fused = fused              # Apply Theta of the next round in the miniround pass instead of a separate pass
+        self.paritycache = paritycache  # Seed Theta from a column parity table kept up to date on write-back instead of reading the last slice block
+
+    def units(self):
+        """
+        Create the register file, slice processor and lane processor of the datapath
+        """
+        return self.datapath.units()
+
+    def fullTheta(self, P, R, S, L):
+        """
+        Load slice blocks sequentially and apply Theta stage on entire state
+        """
+        n = self.datapath.slicesperblock
+        if self.paritycache:
+            S.ParityReg[:] = ParityCache.get(P, R, L, self.datapath).parity[:,63]
+        else:
+            R.loadSliceBlock(self.datapath.nblocks-1, P.sram)
+            S.storeParity(R.R, 63)
+        if self.blockwise:
+            for i in range(self.datapath.nblocks):
+                R.loadSliceBlock(i, P.sram)
+                S.thetaBlock(R.R, i)
+                R.saveSliceBlock(i, P.sram)
+            return
+        for i in range(64):
+            if (i%n == 0):
+                R.loadSliceBlock(int(i/n), P.sram)
+            S.storeParity(R.R, i)
+            S.theta(R.R, i)
+            if (i%n == n-1):
+                R.saveSliceBlock(int(i/n), P.sram)
+
+    def fullrho(self, P, R, S, L):
+        """
+        Load lanes (or lane pairs) sequentially and apply Rho stage of entire state
+        """
+        rho = L.fastRho if self.fastrho else L.rho
+        for i in range(1, self.datapath.nloads+1):
+            R.loadLanes(i, P.sram)
+            rho(R.R, i, P.sram)
+
+    def miniround(self, P, R, S, L, rnd):
+        """
+        Modified round
+        Apply Pi, Chi and Iota stages on entire state
+        """
+        n = self.datapath.slicesperblock
+        if self.blockwise:
+            for i in range(self.datapath.nblocks):
+                R.loadSliceBlock(i, P.sram)
+                S.piBlock(R.R, i)
+                S.chiBlock(R.R, i)
+                S.iotaBlock(R.R, i, rnd)
+                R.saveSliceBlock(i, P.sram)
+            return
+        for i in range(64):
+            if (i%n == 0):
+                R.loadSliceBlock(int(i/n), P.sram)
+            S.pi(R.R, i)
+            S.chi(R.R, i)
+            S.iota(R.R, i, rnd)
+            if (i%n == n-1):
+                R.saveSliceBlock(int(i/n), P.sram)
+
+    def fusedround(self, P, R, S, L, rnd):
+        """
+        Miniround of round rnd fused with Theta of round rnd+1
+        Theta is applied to every slice while it is still in the register after Pi, Chi and Iota, carrying the column parity through ParityReg
+        The parity of slice 63 is only known at the end of the pass, so slice 0 is fixed up by reloading its slice block once
+        """
+        n = self.datapath.slicesperblock
+        S.ParityReg[:] = 0
+        if self.blockwise:
+            for i in range(self.datapath.nblocks):
+                R.loadSliceBlock(i, P.sram)
+                S.piBlock(R.R, i)
+                S.chiBlock(R.R, i)
+                S.iotaBlock(R.R, i, rnd)
+                S.thetaBlock(R.R, i)
+                R.saveSliceBlock(i, P.sram)
+        else:
+            for i in range(64):
+                if (i%n == 0):
+                    R.loadSliceBlock(int(i/n), P.sram)
+                S.pi(R.R, i)
+                S.chi(R.R, i)
+                S.iota(R.R, i, rnd)
+                S.storeParity(R.R, i)
+                S.theta(R.R, i)
+                if (i%n == n-1):
+                    R.saveSliceBlock(int(i/n), P.sram)
+        R.loadSliceBlock(0, P.sram)
+        S.thetaWrap(R.R)
+        R.saveSliceBlock(0, P.sram)
+
+    def folded(self, index):
+        """
+        Whether phase index is a Theta already applied by the fused miniround of the previous round
+        """
+        return self.fused and index%3 == 0 and index > 0
+
+    def readExternalRam(self, sram):
+        """
+        Read SRAM state from external text file
+        Used for testing and debugging
+        """
+        for image in externalRam("externalram.txt").images():
+            sram[:] = image
+            return
+        raise Exception("Incorrect dimensions of filedata")
+
+    def phase(self, P, R, S, L, index):
+        """
+        Run one phase of the schedule, phase 3*r is Theta, 3*r+1 Rho and 3*r+2 the miniround of round r
+        In the fused schedule the miniround of round r also applies Theta of round r+1, and phase 3*r+3 does nothing
+        """
+        rnd = int(index/3)
+        if self.folded(index):
+            return
+        if index%3 == 0:
+            self.fullTheta(P, R, S, L)
+        elif index%3 == 1:
+            self.fullrho(P, R, S, L)
+        elif self.fused and rnd < 23:
+            self.fusedround(P, R, S, L, rnd)
+        else:
+            self.miniround(P, R, S, L, rnd)
+
+    def schedule(self, P, R, S, L, start=0, stop=NPHASES, after=None):
+        """
+        Apply all 24 rounds on the SRAM using the modified round order
+        Theta and Rho of round r+1 follow the miniround (Pi, Chi, Iota) of round r
+        start and stop select a range of phases, after(index, P, R, S, L) is called at every phase boundary with the index of the next phase
+        """
+        if self.paritycache:
+            ParityCache.get(P, R, L, self.datapath).refresh()     # The SRAM may have been written outside the schedule (e.g. absorbing a block)
+        for index in range(start, stop):
+            self.phase(P, R, S, L, index)
+            if after is not None:
+                after(index+1, P, R, S, L)
+
+    def differential(self, P, stop=NPHASES):
+        """
+        Run the schedule and the packed reference in lockstep from the SRAM of P and compare the SRAM after every phase
+        Theta and Rho of the schedule match theta and rho of the reference, the miniround matches pi, chi and iota of the same round (and theta of the next round when fused)
+        P is not modified
+        Returns None if every phase matched, otherwise the first differing phase as a dict of
+            phase, round, step : phase index, round and name (theta, rho or miniround)
+            bits : differing state bits as (x, y, z)
+            lanes, slices, words : differing lanes (5*x+y), slices (z) and SRAM words
+        """
+        Q = memPopulate()
+        Q.sram[:] = P.sram
+        R, S, L = self.units()
+        I = packedImplementation(R.MemToState(Q.sram))
+        for index in range(stop):
+            rnd = int(index/3)
+            self.phase(Q, R, S, L, index)
+            if self.folded(index):
+                continue
+            if index%3 == 0:
+                I.theta()
+            elif index%3 == 1:
+                I.rho()
+            else:
+                I.pi()
+                I.chi()
+                I.iota(rnd)
+                if self.fused and rnd < 23:
+                    I.theta()
+            expected = I.bits()[memPopulate.memindex]
+            differing = numpy.flatnonzero(Q.bits != expected)
+            if differing.size:
+                statebits = memPopulate.memindex[differing]
+                return { "phase" : index,
+                         "round" : rnd,
+                         "step" : PHASENAMES[index%3],
+                         "bits" : sorted((int(b/320), int(b/64)%5, int(b%64)) for b in statebits),
+                         "lanes" : sorted(set(int(b/64) for b in statebits)),
+                         "slices" : sorted(set(int(b%64) for b in statebits)),
+                         "words" : sorted(set(int(p/8) for p in differing)) }
+        return None
+
+    def run(self, P):
+        """
+        Apply the schedule to the SRAM of P with a fresh datapath, returns the final SRAM
+        """
+        R, S, L = self.units()
+        self.schedule(P, R, S, L)
+        return P.snapshot()
+
+    def verify(self, strinp):
+        """
+        Run the simulation on a string and compare the output state with the reference implementation
+        Returns whether the states matched and the final SRAM instead of exiting on a mismatch
+        """
+        P = memPopulate()
+        P.populate(strinp)
+
+        R, S, L = self.units()
+
+        if (R.MemToState(P.sram) != P.A).any():
+            return False, P.snapshot()
+
+        self.schedule(P, R, S, L)
+        tempram = P.snapshot()
+
+        I = packedImplementation(P.A)
+        I.Keccak()
+        P.StateToMem(I.A)
+
+        return bool((P.sram == tempram).all()), tempram
+
+    def profile(self, strinp):
+        """
+        Run the simulation on a string with instrumentation attached and return the Instrumentation object
+        The instrumentation is detached again before returning
+        """
+        P = memPopulate()
+        P.populate(strinp)
+
+        R, S, L = self.units()
+
+        probe = Instrumentation()
+        probe.attach(self, R, L)
+        try:
+            self.schedule(P, R, S, L)
+        finally:
+            probe.detach()          # Later runs on this instance are not counted
+        return probe
+
+    def Keccak(self):
+        """
+        Function to implement overall algorithm, output the final state and compare it to the standard implementation
+        """
+        P = memPopulate()
+        P.populate(str(input("Enter String - ")))
+        initial = P.snapshot()
+
+        R, S, L = self.units()
+
+        A = R.MemToState(P.sram)
+        if (A != P.A).any():
+            print("Mismatch")
+            sys.exit()
+
+        self.schedule(P, R, S, L)
+
+        tempram = P.snapshot()
+
+        I = packedImplementation(P.A)
+        I.Keccak()              #Reference implementation
+        P.StateToMem(I.A)       #Convert reference implementation output state to SRAM format for comparison
+
+        #Compare contents of SRAM with reference
+        if (P.sram != tempram).any():
+            print("State does not match with reference")
+            P.sram[:] = initial
+            diff = self.differential(P)
+            if diff is not None:
+                print("First mismatch in round %d %s, lanes %s, slices %s" % (diff["round"], diff["step"], diff["lanes"], diff["slices"]))
+            sys.exit()
+
+        print("Output state matched with reference")
+
+        A = R.MemToState(tempram)
+
+        print("Output state - ")
+        for i in range(5):
+            for j in range(5):
+                for k in range(64):
+                    print(A[i][j][k], end='')
+                print("")
+
+    def test(self, permute=True):
+        """
+        Read the SRAM from externalram.txt, apply the schedule (unless permute is False) and print the SRAM in hex
+        """
+        P = memPopulate()
+        R, S, L = self.units()
+
+        self.readExternalRam(P.sram)
+
+        if permute:
+            self.schedule(P, R, S, L)
+
+        for i, word in enumerate(P.packed()):
+            print("%d : %02X" % (i, word))
+
+def wrapMethod(obj, name, before, after=None):
+    """
+    Replace a method of an instance by a wrapper calling before(*args) first and after(*args) last
+    Returns the attribute of the instance that was replaced (None when the method came from the class), for unwrapMethod
+    """
+    previous = vars(obj).get(name)
+    method = getattr(obj, name)
+    def wrapped(*args):
+        before(*args)
+        result = method(*args)
+        if after is not None:
+            after(*args)
+        return result
+    setattr(obj, name, wrapped)
+    return previous
+
+def unwrapMethod(obj, name, previous):
+    """
+    Undo wrapMethod, previous is the value it returned
+    """
+    if previous is None:
+        delattr(obj, name)
+    else:
+        setattr(obj, name, previous)
+
+class ParityCache:
+
+    """
+    Column parity table (5*64, parity[x][z]) of the state held in an SRAM
+    The table follows every write-back: slice blocks saved by the register refresh the parity of their slices, and Rho updates the columns of the lanes it rotates
+    Theta then takes the parity of slice 63 from the table instead of reading the last slice block
+    """
+
+    columnbits = memPopulate.sramindex.reshape(5,5,64).transpose(0,2,1)     # SRAM bits of the 5 elements of column (x,z)
+    columnbits.flags.writeable = False
+
+    def __init__(self, P, datapath):
+        self.P = P
+        self.datapath = datapath
+        self.parity = numpy.zeros(shape=(5,64), dtype=int)
+        self.old = numpy.zeros(shape=(datapath.lanesperload,64), dtype=numpy.uint8)
+        self.refresh()
+
+    @classmethod
+    def get(cls, P, R, L, datapath):
+        """
+        Cache of the SRAM of P attached to the register and lane processor, created on first use
+        When the register and lane processor are reused with another SRAM, the attached cache is pointed at it and refreshed instead of wrapping them again
+        """
+        cache = getattr(R, "paritycache", None)
+        if cache is None:
+            cache = cls(P, datapath)
+            cache.attach(R, L)
+            R.paritycache = cache
+        elif cache.P is not P:
+            cache.P = P
+            cache.refresh()
+        return cache
+
+    def refresh(self, slices=slice(None)):
+        """
+        Recompute the parity of the given slices from the SRAM
+        """
+        self.parity[:,slices] = numpy.bitwise_xor.reduce(self.P.bits[self.columnbits[:,slices]], axis=-1)
+
+    def lanes(self, b):
+        """
+        Lanes held in the register by lane load b (Lane(0,0) is never rotated)
+        """
+        n = self.datapath.lanesperload
+        return range(n*(b-1)+1, n*b+1)
+
+    def attach(self, R, L):
+        """
+        Install write-back hooks on a Register and LaneProcessor instance
+        """
+        n = self.datapath.slicesperblock
+        def saveblock(i, sram):
+            self.refresh(slice(n*i, n*i+n))
+        def before(R, b, sram):
+            for k, lane in enumerate(self.lanes(b)):
+                self.old[k] = self.P.bits[memPopulate.sramindex[64*lane:64*lane+64]]
+        def after(R, b, sram):
+            for k, lane in enumerate(self.lanes(b)):
+                self.parity[int(lane/5)] ^= self.old[k] ^ self.P.bits[memPopulate.sramindex[64*lane:64*lane+64]]
+        wrapMethod(R, "saveSliceBlock", lambda i, sram : None, saveblock)
+        wrapMethod(L, "rho", before, after)
+        wrapMethod(L, "fastRho", before, after)
+
+class Instrumentation:
+
+    """
+    Counts SRAM word reads and writes, register loads and barrel shifter uses of the simulated datapath
+    Counting wrappers are only installed on the instances passed to attach and are removed by detach, so the simulation runs unmodified when it is not attached
+    Counts are kept per round and per phase (theta, rho and miniround), rounds follow the modified round order of SHA3.schedule
+    """
+
+    EVENTS = ["sram reads", "sram writes", "register loads", "barrel shifts"]
+    PHASES = ["theta", "rho", "miniround"]
+
+    def __init__(self):
+        self.counts = {}                # (round, phase) -> event -> count
+        self.wrapped = []               # (instance, method name, replaced attribute) of every installed wrapper
+        self.phase = None
+        self.round = 0
+
+    def count(self, event, n=1):
+        key = (self.round, self.phase)
+        if key not in self.counts:
+            self.counts[key] = dict.fromkeys(self.EVENTS, 0)
+        self.counts[key][event] += n
+
+    def attach(self, sha, R, L):
+        """
+        Install counting wrappers on a SHA3, Register and LaneProcessor instance
+        """
+        blockwords = [numpy.unique(words//8).size for words in R.blockmap]     # SRAM words touched by each slice block
+        lanewords = [numpy.unique(words//8).size for words in R.lanemap]
+        lanesperload = sha.datapath.lanesperload
+
+        def block(i, sram):
+            self.count("sram reads", blockwords[i])
+            self.count("register loads")
+        def saveblock(i, sram):
+            self.count("sram writes", blockwords[i])
+        def lane(b, sram):
+            self.count("sram reads", lanewords[b])
+            self.count("register loads")
+        def rho(R, lane, sram):
+            if lane > 0:
+                self.count("sram writes", 16)
+                self.count("barrel shifts", 2*16*lanesperload)      # Left and right shift of every register section
+
+        hooks = [(R, "loadSliceBlock", block, None),
+                 (R, "saveSliceBlock", saveblock, None),
+                 (R, "loadLanes", lane, None),
+                 (L, "rho", rho, None),
+                 (L, "fastRho", rho, None)]     # Counts the Barrel Shifter uses of the hardware it stands for
+
+        def enter(phase):
+            def before(*args):
+                self.phase = phase
+            return before
+        def miniround(P, R, S, L, rnd):
+            self.phase = "miniround"
+            self.round = rnd
+        def advance(P, R, S, L, rnd):   # Theta and Rho after miniround i belong to round i+1
+            self.round = rnd + 1
+        hooks += [(sha, "fullTheta", enter("theta"), None),
+                  (sha, "fullrho", enter("rho"), None),
+                  (sha, "miniround", miniround, advance),
+                  (sha, "fusedround", miniround, advance)]
+        self.wrapped = [(obj, name, wrapMethod(obj, name, before, after)) for obj, name, before, after in hooks]
+
+    def detach(self):
+        """
+        Remove the counting wrappers installed by attach, the instances run unmodified again
+        """
+        for obj, name, previous in reversed(self.wrapped):
+            unwrapMethod(obj, name, previous)
+        self.wrapped = []
+
+    def totals(self, by="phase"):
+        """
+        Sum the counts per phase (by="phase"), per round (by="round") or over the whole run (by=None)
+        """
+        result = {}
+        for (rnd, phase), counts in self.counts.items():
+            key = phase if by == "phase" else rnd if by == "round" else "total"
+            if key not in result:
+                result[key] = dict.fromkeys(self.EVENTS, 0)
+            for event in self.EVENTS:
+                result[key][event] += counts[event]
+        return result
+
+    def report(self):
+        """
+        Format the per phase and per round counts as a table
+        The SRAM is single ported, so SRAM reads + writes is used as the latency proxy
+        """
+        lines = ["%-12s" % "" + "".join("%16s" % event for event in self.EVENTS) + "%16s" % "sram accesses"]
+        def row(name, counts):
+            return "%-12s" % name + "".join("%16d" % counts[event] for event in self.EVENTS) + "%16d" % (counts["sram reads"] + counts["sram writes"])
+        phases = self.totals("phase")
+        for phase in self.PHASES:
+            if phase in phases:
+                lines.append(row(phase, phases[phase]))
+        rounds = self.totals("round")
+        for rnd in sorted(rounds):
+            lines.append(row("round %d" % rnd, rounds[rnd]))
+        for name, counts in self.totals(None).items():
+            lines.append(row(name, counts))
+        return "\n".join(lines)
+
+def compareTraffic(strinp, options, backends=None):
+    """
+    SRAM traffic of the plain schedule and of the schedule with the given SHA3 options (e.g. {"fused" : True}) for every datapath on a string
+    The SRAM is single ported, so SRAM accesses (reads + writes) are also the cycle count of the SRAM bound passes
+    Returns {name : {event : (plain, variant, saved)}} for the events of Instrumentation and "sram accesses"
+    """
+    results = {}
+    for name in (backends or sorted(BACKENDS)):
+        counts = []
+        for variant in ({}, options):
+            total = SHA3(name, True, True, **variant).profile(strinp).totals(None)["total"]
+            total["sram accesses"] = total["sram reads"] + total["sram writes"]
+            counts.append(total)
+        results[name] = {event : (counts[0][event], counts[1][event], counts[0][event] - counts[1][event]) for event in counts[0]}
+    return results
+
+def fusion(strinp, backends=None):
+    """
+    SRAM traffic of the plain and the fused schedule of every datapath, see compareTraffic
+    """
+    return compareTraffic(strinp, {"fused" : True}, backends)
+
+def parityCacheSavings(strinp, backends=None):
+    """
+    SRAM traffic of the plain schedule and of the schedule seeding Theta from the parity cache, see compareTraffic
+    """
+    return compareTraffic(strinp, {"paritycache" : True}, backends)
+
+def sweep(strinp, backends=None, blockwise=False, fastrho=False):
+    """
+    Run several datapaths on the same string against a single reference result
+    The string is padded and the reference implementation is run once, then every backend runs on a copy of the initial SRAM
+    Returns {name : (matched, final SRAM)}
+    """
+    P = memPopulate()
+    P.populate(strinp)
+    initial = P.snapshot()
+
+    I = packedImplementation(P.A)
+    I.Keccak()
+    reference = memPopulate().StateToMem(I.A)
+
+    results = {}
+    for name in (backends or sorted(BACKENDS)):
+        P.sram[:] = initial
+        final = SHA3(name, blockwise, fastrho).run(P)
+        results[name] = (bool((final == reference).all()), final)
+    return results
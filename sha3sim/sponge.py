@@ -0,0 +1,163 @@
+"""
+Sponge construction on top of the SRAM layout permutation
+Messages of any length are absorbed block by block straight into the interleaved SRAM image, and every block runs the round schedule of a datapath backend
+The padding, rates and domain suffixes follow FIPS 202, but the permutation is the one of the datapaths (rotation offsets indexed by lane 5*x+y, lanes rotated right), so digests do not match FIPS 202 or hashlib
+"""
+
+import numpy
+import time
+
+from .core import memPopulate
+from .sha3 import SHA3
+
+# Parameter sets named after FIPS 202: rate in bits, domain suffix and digest length in bytes (None for extendable output)
+# Only the parameters are those of FIPS 202, the digests come from the datapath permutation and differ from hashlib
+MODES = { "SHA3-224" : (1152, 0x06, 28),
+          "SHA3-256" : (1088, 0x06, 32),
+          "SHA3-384" : (832, 0x06, 48),
+          "SHA3-512" : (576, 0x06, 64),
+          "SHAKE128" : (1344, 0x1F, None),
+          "SHAKE256" : (1088, 0x1F, None) }
+
+class Sponge:
+    """
+    Keccak sponge whose state is the interleaved 200*8 SRAM of memPopulate
+    Message bytes are mapped to the state in FIPS 202 order (bit i of byte j is message bit 8*j+i, message bit k is bit k%64 of lane x+5*y = int(k/64))
+    Input is consumed as an iterator of byte chunks, only a partial block is buffered
+    """
+
+    def __init__(self, backend="V1", rate=1088, suffix=0x06, blockwise=False):
+        if rate%64 or not 0 < rate < 1600:
+            raise Exception("Rate must be a multiple of 64 bits below 1600")
+        self.sha = SHA3(backend, blockwise)
+        self.rate = rate                        # Rate in bits
+        self.blockbytes = int(rate/8)
+        self.suffix = suffix                    # Domain separation bits followed by the first padding bit (0x06 for SHA-3, 0x1F for SHAKE)
+        self.rateindex = memPopulate.messageindex[0:rate]
+        self.P = memPopulate()
+        self.R, self.S, self.L = self.sha.units()
+        self.buffer = bytearray()               # Bytes not yet absorbed (less than one block)
+        self.permutations = 0
+        self.squeezed = None                    # Bytes of the current output block not yet returned, None while absorbing
+
+    def permute(self):
+        """
+        Apply the round schedule of the datapath to the SRAM
+        """
+        self.sha.schedule(self.P, self.R, self.S, self.L)
+        self.permutations += 1
+
+    def absorbBlock(self, block):
+        """
+        XOR one rate sized block into the SRAM and permute
+        """
+        bits = numpy.unpackbits(numpy.frombuffer(bytes(block), dtype=numpy.uint8), bitorder='little')
+        self.P.bits[self.rateindex] ^= bits
+        self.permute()
+
+    def absorb(self, chunks):
+        """
+        Absorb an iterable of byte chunks (bytes, bytearray or str, which is encoded as UTF-8)
+        May be called repeatedly before squeezing
+        """
+        if self.squeezed is not None:
+            raise Exception("Cannot absorb after squeezing")
+        if isinstance(chunks, (bytes, bytearray, str)):
+            chunks = [chunks]
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            self.buffer += chunk
+            start = 0
+            while len(self.buffer) - start >= self.blockbytes:
+                self.absorbBlock(self.buffer[start:start+self.blockbytes])
+                start += self.blockbytes
+            del self.buffer[0:start]
+        return self
+
+    def pad(self):
+        """
+        Pad the buffered bytes with the suffix and the final bit (pad10*1) and absorb the last block
+        """
+        block = bytearray(self.buffer) + bytearray(self.blockbytes - len(self.buffer))
+        block[len(self.buffer)] ^= self.suffix
+        block[-1] ^= 0x80
+        self.buffer = bytearray()
+        self.absorbBlock(block)
+        self.squeezed = self.output()
+
+    def output(self):
+        """
+        Read the rate part of the SRAM as bytes
+        """
+        return numpy.packbits(self.P.bits[self.rateindex], bitorder='little').tobytes()
+
+    def squeeze(self, nbytes):
+        """
+        Return the next nbytes of output, permuting whenever a block of output is used up
+        """
+        if self.squeezed is None:
+            self.pad()
+        out = bytearray()
+        while len(out) < nbytes:
+            if not self.squeezed:
+                self.permute()
+                self.squeezed = self.output()
+            take = min(nbytes - len(out), len(self.squeezed))
+            out += self.squeezed[0:take]
+            self.squeezed = self.squeezed[take:]
+        return bytes(out)
+
+def digest(chunks, backend="V1", rate=1088, suffix=0x06, nbytes=32, blockwise=False):
+    """
+    Hash an iterable of byte chunks with the sponge and return nbytes of output
+    """
+    return Sponge(backend, rate, suffix, blockwise).absorb(chunks).squeeze(nbytes)
+
+def getMode(mode):
+    """
+    Look up the rate, suffix and digest length of a parameter set
+    """
+    if mode not in MODES:
+        raise Exception("Unknown mode %s, supported modes are %s" % (mode, ", ".join(MODES)))
+    return MODES[mode]
+
+def new(mode, backend="V1", blockwise=False):
+    """
+    Create a sponge for one of the FIPS 202 parameter sets
+    """
+    rate, suffix, length = getMode(mode)
+    return Sponge(backend, rate, suffix, blockwise)
+
+def hashMessage(mode, chunks, backend="V1", nbytes=None, blockwise=False):
+    """
+    Hash an iterable of byte chunks with the parameters of one of the FIPS 202 modes, see MODES for why the digest differs from FIPS 202
+    SHA3 modes return their digest truncated from the rate part of the SRAM, SHAKE modes squeeze nbytes (which is then required)
+    """
+    rate, suffix, length = getMode(mode)
+    if length is None:
+        if nbytes is None:
+            raise Exception("Output length required for %s" % mode)
+        length = nbytes
+    return new(mode, backend, blockwise).absorb(chunks).squeeze(length)
+
+def throughput(modes=None, backend="V1", nbytes=1024, outbytes=32, blockwise=False):
+    """
+    Time hashing nbytes of fixed data in each mode on a datapath
+    The rate sets how many permutations each payload byte costs, so permutations per byte are reported with the timing
+    Returns {mode : {"bytes", "permutations", "seconds", "bytes per second", "permutations per byte"}}
+    """
+    data = bytes(bytearray(i%256 for i in range(nbytes)))
+    results = {}
+    for mode in (modes or MODES):
+        rate, suffix, length = getMode(mode)
+        sponge = new(mode, backend, blockwise)
+        start = time.perf_counter()
+        sponge.absorb([data]).squeeze(length or outbytes)
+        seconds = time.perf_counter() - start
+        results[mode] = { "bytes" : nbytes,
+                          "permutations" : sponge.permutations,
+                          "seconds" : seconds,
+                          "bytes per second" : nbytes/seconds,
+                          "permutations per byte" : sponge.permutations/nbytes if nbytes else None }
+    return results
@@ -0,0 +1,157 @@
+"""
+Version 1 datapath
+Two 64 bit registers: slice blocks of 4 slices and lane pairs are processed per register load
+"""
+
+import numpy
+import sys
+
+from .backends import Datapath, register
+from . import core
+from .core import ROTATIONOFFSETS
+
+class Register:
+    """
+    Contains the 2 64 bit registers and functions to save and extract slice blocks and lane pairs to/from the SRAM 
+    The SRAM addresses are precomputed as indices into the flattened 1600 bit SRAM, so each load and save is a single gather or scatter
+    """
+
+    # SRAM bits of register 0 for each slice block, register 1 uses the next bit of every pair
+    blockmap = numpy.array([[8*int(i/2)+(i%2)*4, 8*int(i/2)+(i%2)*4+2] + [8*w+j for w in range(23-(15-i), 200-(15-i), 16) for j in range(0, 8, 2)] for i in range(16)])
+    blockmap = numpy.stack((blockmap, blockmap+1), axis=1)
+    blockmap.flags.writeable = False
+
+    # SRAM bits of both registers for each lane pair, Lane(0,0) is only loaded to register 0
+    lanemap = numpy.array([[8*(8+(b-1)*16)+8*int(p/4)+2*(p%4) for p in range(64)] for b in range(13)])
+    lanemap = numpy.stack((lanemap, lanemap+1), axis=1)
+    lanemap[0] = numpy.arange(64)
+    lanemap.flags.writeable = False
+
+    # SRAM bit holding bit z of lane 5*x+y, Lane(0,0) from register 0 of lane pair 0 and the lanes of pair b in registers 0 and 1
+    stateindex = numpy.concatenate((lanemap[0][0:1], lanemap[1:].reshape(24,64)))
+    stateindex.flags.writeable = False
+
+    def __init__(self):
+        self.R = numpy.zeros(shape=(2,64), dtype=int)   #Two 64 bit registers
+
+    def loadSliceBlock(self, i, sram):
+        """
+        Load a block of 4 consecutive slices from SRAM to register (100 bits)
+        """
+        if (i > 15):
+            print("Slice block out of bounds")
+            sys.exit()
+        self.R[:,0:50] = sram.reshape(-1)[self.blockmap[i]]
+
+    def saveSliceBlock(self, i, sram):
+        """
+        Save a block of 4 consecutive slices from register to SRAM(100 bits)
+        """
+        if (i > 15):
+            print("Slice block out of bounds")
+            sys.exit()
+        numpy.put(sram, self.blockmap[i], self.R[:,0:50])     # Scatter through flat indices, also for SRAM arrays that are not C contiguous
+    
+    def loadLanePair(self, b, sram):
+        """
+        Load two consecutive lanes from SRAM to register (128 bits)
+        If Lane(0,0) is loaded, then only register 0 is filled (64 bits)
+        """
+        if b==0:
+            self.R[0] = sram.reshape(-1)[self.lanemap[0][0]]
+        elif b < 13:
+            self.R[:] = sram.reshape(-1)[self.lanemap[b]]
+        else:
+            print("Lane pair out of bounds")
+            sys.exit()
+
+    loadLanes = loadLanePair        # Lane load used by the schedule (lane pairs for this datapath)
+
+    def MemToState(self, sram):
+        """
+        Convert a 200*8 block of SRAM to a 5*5*64 state for printing the result
+        The SRAM bits of every lane are gathered at once through stateindex instead of loading the lane pairs one by one
+        """
+        return sram.reshape(-1)[self.stateindex].reshape(5,5,64).astype(int)
+
+    def cleanRam(self, sram):
+        """
+        Erases contents of SRAM
+        """
+        sram[:] = 0
+    
+class SliceProcessor(core.SliceProcessor):
+    
+    """
+    Contains the positions of a slice in the registers of this datapath, the slice wise operations are shared in core.SliceProcessor
+    """
+
+    # Indices [register, bit] of the (x,y) element of a slice for each value of pos%4, as computed by the original extractslice
+    # Lane 5*x+y > 0 sits in register 1-(5*x+y)%2 at bit 2+pos%4+4*int((5*x+y-1)/2), Lane(0,0) at [pos%2, int(pos/2)]
+    slicex = numpy.zeros(shape=(4,5,5,2), dtype=int)
+    slicex[:,:,:,0] = (1 - numpy.arange(25)%2).reshape(5,5)
+    slicex[:,:,:,1] = (numpy.arange(4).reshape(4,1) + 2 + 4*((numpy.arange(25)-1)//2)).reshape(4,5,5)
+    slicex[:,0,0] = [[0, 0], [1, 0], [0, 1], [1, 1]]
+    slicex.flags.writeable = False
+    sliceidx = 64*slicex[...,0] + slicex[...,1]     # Same indices into the flattened 2*64 registers
+    sliceidx.flags.writeable = False
+    pisrc = sliceidx[:, (numpy.indices((5,5))[0]+3*numpy.indices((5,5))[1])%5, numpy.indices((5,5))[0]]     # Source of the (x,y) element for Pi
+    pisrc.flags.writeable = False
+
+class LaneProcessor(core.LaneProcessor):
+
+    """
+    Contains functions that simulate lane wise operations for the given datapath and constraints, the Barrel Shifter primitives are shared in core.LaneProcessor
+    """
+
+    rotc = ROTATIONOFFSETS[1:]      # Keccak rotation offsets, Lane(0,0) is not rotated
+
+    # Register bits rotated into each SRAM bit of lane pair b+1 by fastRho, bit z of a lane comes from bit z+rot
+    rhosrc = numpy.array([[[64*k+(z+ROTATIONOFFSETS[2*b+1+k])%64 for z in range(64)] for k in range(2)] for b in range(12)])
+    rhosrc.flags.writeable = False
+    rhodest = Register.lanemap[1:]
+
+    def __init__(self):
+        self.rhounit = numpy.zeros(shape=(2,4), dtype=int)
+        self.shifted = numpy.zeros(shape=(4,), dtype=int)      # Right shifted section before it is XORed into a Rho Unit register
+        self.section = numpy.zeros(shape=(5,), dtype=int)      # Register section read by a Barrel Shifter, section[4] stays 0
+
+    def rho(self, R, lanepair, sram):
+        """
+        Applies Rho stage on two consecutive lanes
+        Lane(0,0) is omitted since it requires no rotation
+        The Barrel Shifters work in place on the Rho Unit registers and the scratch buffers, so no arrays are allocated per section
+        """
+        if (lanepair > 0):
+            offset = 8 + (lanepair-1)*16            # Offset points to initial SRAM address
+            lowerbits = [0, 0]                      # Lower 2 bits of the rotation constants (fed to Barrel Shifters)
+            upperbits = [0, 0]                      # Upper 4 bits of the rotation constants (for register addressing)
+            for k in range(2):
+                rot = self.rotc[2*(lanepair-1)+k]   # Rotation constant for lane k of the pair
+                lowerbits[k] = rot%4
+                upperbits[k] = int(rot/4)
+
+            for r in range(16):                     # Iterate through all 16 register sections
+
+                for k in range(2):
+                    self.section[0:4] = R[k][4*upperbits[k]:4*upperbits[k]+4]                   # Read register section
+                    self.shift_array_left_into(self.rhounit[k], self.section, lowerbits[k])     # Shift left using Barrel Shifter into Rho Unit register
+
+                    nextsection = 4*((upperbits[k]+1)%16)
+                    self.section[0:4] = R[k][nextsection:nextsection+4]                         # Read next register section
+                    self.shift_array_right_into(self.shifted, self.section, 4-lowerbits[k])     # Shift right using Barrel Shifter
+                    self.xor_arrays_into(self.rhounit[k], self.shifted)                         # XOR shifted data in Rho Unit register
+
+                    sram[offset+r][k::2] = self.rhounit[k]      # Interleave contents of Rho Unit registers and save to appropriate SRAM address
+
+                    upperbits[k] = (upperbits[k]+1)%16          # Increment register addresses
+
+    def fastRho(self, R, lanepair, sram):
+        """
+        Applies Rho stage on two consecutive lanes by rotating both lanes at once and writing them back to the interleaved words in one step
+        Gives the same SRAM as rho without simulating the Barrel Shifter
+        """
+        if (lanepair > 0):
+            numpy.put(sram, self.rhodest[lanepair-1], R.reshape(-1)[self.rhosrc[lanepair-1]])
+
+register("V1", Datapath(Register, SliceProcessor, LaneProcessor, slicesperblock=4, lanesperload=2))
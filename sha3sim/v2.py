@@ -0,0 +1,146 @@
+"""
+Version 2 datapath
+A single 64 bit register: slice pairs and single lanes are processed per register load
+Version 3 only changes the RTL control, so its simulation uses the same datapath
+"""
+
+import math
+import numpy
+import sys
+
+from .backends import Datapath, register
+from . import core
+from .core import ROTATIONOFFSETS
+
+class Register:
+    """
+    Contains the 64 bit registers and functions to save and extract slice pairs and lanes to/from the SRAM 
+    The SRAM addresses are precomputed as indices into the flattened 1600 bit SRAM, so each load and save is a single gather or scatter
+    """
+
+    # SRAM bits of the register for each slice pair
+    blockmap = numpy.array([[2*i, 2*i+1] + [8*w+(i%2)*4+k for w in range(23-(15-int(i/2)), 200-(15-int(i/2)), 16) for k in range(4)] for i in range(32)])
+    blockmap.flags.writeable = False
+
+    # SRAM bits of the register for each lane
+    lanemap = numpy.array([[8*(8+(int((b+1)/2)-1)*16)+8*int(p/4)+2*(p%4)+1-b%2 for p in range(64)] for b in range(25)])
+    lanemap[0] = numpy.arange(64)
+    lanemap.flags.writeable = False
+
+    stateindex = lanemap        # SRAM bit holding bit z of lane 5*x+y
+
+    def __init__(self):
+        self.R = numpy.zeros(shape=(64,), dtype=int)   #One 64 bit register
+
+    def loadSliceBlock(self, i, sram):
+        """
+        Load a block of 2 consecutive slices from SRAM to register (50 bits)
+        """
+        if (i > 31):
+            print("Slice pair out of bounds")
+            sys.exit()
+        self.R[0:50] = sram.reshape(-1)[self.blockmap[i]]
+
+    def saveSliceBlock(self, i, sram):
+        """
+        Save a block of 2 consecutive slices to SRAM from register (50 bits)
+        """
+        if (i > 31):
+            print("Slice pair out of bounds")
+            sys.exit()
+        numpy.put(sram, self.blockmap[i], self.R[0:50])        # Scatter through flat indices, also for SRAM arrays that are not C contiguous
+
+    def loadLane(self, b, sram):
+        """
+        Load a Lane from SRAM to register (64 bits bits)
+        """
+        if (b > 24):
+            print("Lane index out of bounds")
+            sys.exit()
+        self.R[:] = sram.reshape(-1)[self.lanemap[b]]
+
+    loadLanes = loadLane            # Lane load used by the schedule (single lanes for this datapath)
+
+    def MemToState(self, sram):
+        """
+        Convert a 200*8 block of SRAM to a 5*5*64 state for printing the result
+        The SRAM bits of every lane are gathered at once through stateindex instead of loading the lanes one by one
+        """
+        return sram.reshape(-1)[self.stateindex].reshape(5,5,64).astype(int)
+
+    def cleanRam(self, sram):
+        """
+        Erases contents of SRAM
+        """
+        sram[:] = 0
+
+class SliceProcessor(core.SliceProcessor):
+    
+    """
+    Contains the positions of a slice in the registers of this datapath, the slice wise operations are shared in core.SliceProcessor
+    """
+
+    # Indices of the (x,y) element of a slice in the register for each value of pos%2, as computed by the original extractslice
+    # Lane 5*x+y > 0 sits at bit 2*(5*x+y)+2*(pos%2)-1+(5*x+y)%2, Lane(0,0) at pos%2
+    slicex = 2*numpy.arange(25).reshape(5,5) + 2*numpy.arange(2).reshape(2,1,1) - 1 + numpy.arange(25).reshape(5,5)%2
+    slicex[:,0,0] = [0, 1]
+    slicex.flags.writeable = False
+    sliceidx = slicex
+    pisrc = sliceidx[:, (numpy.indices((5,5))[0]+3*numpy.indices((5,5))[1])%5, numpy.indices((5,5))[0]]     # Source of the (x,y) element for Pi
+    pisrc.flags.writeable = False
+
+class LaneProcessor(core.LaneProcessor):
+
+    """
+    Contains functions that simulate lane wise operations for the given datapath and constraints, the Barrel Shifter primitives are shared in core.LaneProcessor
+    """
+
+    rotc = ROTATIONOFFSETS[1:]      # Keccak rotation offsets, Lane(0,0) is not rotated
+
+    # Register bits rotated into each SRAM bit of lane b+1 by fastRho, bit z of the lane comes from bit z+rot
+    rhosrc = numpy.array([[(z+ROTATIONOFFSETS[b+1])%64 for z in range(64)] for b in range(24)])
+    rhosrc.flags.writeable = False
+    rhodest = Register.lanemap[1:]
+
+    def __init__(self):
+        self.rhounit = numpy.zeros(shape=(4), dtype=int)
+        self.shifted = numpy.zeros(shape=(4,), dtype=int)      # Right shifted section before it is XORed into the Rho Unit register
+        self.section = numpy.zeros(shape=(5,), dtype=int)      # Register section read by the Barrel Shifter, section[4] stays 0
+
+    def rho(self, R, lane, sram):
+        """
+        Applies Rho stage on a lane
+        Lane(0,0) is omitted since it requires no rotation
+        The Barrel Shifter works in place on the Rho Unit register and the scratch buffers, so no arrays are allocated per section
+        """
+        if (lane > 0):
+            offset = 8 + (math.ceil(lane/2.0)-1)*16            # Offset points to initial SRAM address
+            rot1 = self.rotc[lane-1]        # Rotation constant
+            rot1lowerbits = rot1%4                  # Extract lower 2 bits of rotation constant for first lane (fed to Barrel Shifter)
+            rot1upperbits = int(rot1/4)             # Extract upper 4 bits of rotation constant for first lane (for register addressing)
+            half = 1 - lane%2                       # Interleaved half of the SRAM words holding the lane
+
+            for r in range(16):                     # Iterate through all 16 register sections
+
+                self.section[0:4] = R[4*rot1upperbits:4*rot1upperbits+4]                # Read register section
+                self.shift_array_left_into(self.rhounit, self.section, rot1lowerbits)   # Shift left using Barrel Shifter into Rho Unit register
+
+                nextsection = 4*((rot1upperbits+1)%16)
+                self.section[0:4] = R[nextsection:nextsection+4]                        # Read next register section
+                self.shift_array_right_into(self.shifted, self.section, 4-rot1lowerbits)   # Shift right using Barrel Shifter
+                self.xor_arrays_into(self.rhounit, self.shifted)                        # XOR shifted data in Rho Unit register
+
+                sram[offset+r][half::2] = self.rhounit  # Interleave contents of Rho Unit register and save to appropriate SRAM address
+
+                rot1upperbits = (rot1upperbits+1)%16       # Increment register addresses
+
+    def fastRho(self, R, lane, sram):
+        """
+        Applies Rho stage on a lane by rotating the whole lane and writing it back to the interleaved words in one step
+        Gives the same SRAM as rho without simulating the Barrel Shifter
+        """
+        if (lane > 0):
+            numpy.put(sram, self.rhodest[lane-1], R[self.rhosrc[lane-1]])
+
+register("V2", Datapath(Register, SliceProcessor, LaneProcessor, slicesperblock=2, lanesperload=1))
+register("V3", Datapath(Register, SliceProcessor, LaneProcessor, slicesperblock=2, lanesperload=1))